@@ -1,20 +1,123 @@
+import math
 import numpy as np
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 from mcp_robot.contracts.schemas import JointTrajectoryChunk, JointState
+from mcp_robot.runtime.jit import njit, NUMBA_AVAILABLE
+
+# Optional GPU array backend for very large plans
+try:
+    import cupy
+    CUPY_AVAILABLE = True
+except ImportError:
+    cupy = None
+    CUPY_AVAILABLE = False
+
+# Below this many targets, host<->device copies outweigh the GPU win
+GPU_BATCH_THRESHOLD = 1024
+
+# The geometric IK solves exactly this many joints
+IK_JOINT_COUNT = 7
+
+DEFAULT_JOINT_NAMES = ("joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6", "joint_7")
+DEFAULT_WORKSPACE = {"x": {"min": -1, "max": 1}, "y": {"min": -1, "max": 1}, "z": {"min": 0, "max": 1}}
+
+@njit(cache=True)
+def _ik7(x: float, y: float, z: float, base_height: float, l1: float, l2: float):
+    """
+    Scalar 7-DOF geometric IK kernel (math.* only, no NumPy dispatch).
+    """
+    # 1. Base Rotation
+    q1 = math.atan2(y, x)
+
+    # 2. Geometric Approximation for Reach
+    r = math.sqrt(x * x + y * y)
+    h = z - base_height
+    dist = math.sqrt(r * r + h * h)
+
+    # Law of Cosines for Elbow (q4)
+    cos_q4 = (dist * dist - l1 * l1 - l2 * l2) / (2 * l1 * l2)
+    if cos_q4 > 1.0:
+        cos_q4 = 1.0
+    elif cos_q4 < -1.0:
+        cos_q4 = -1.0
+    q4 = -math.acos(cos_q4)
+
+    # Shoulder (q2)
+    q2 = math.atan2(h, r) + math.atan2(l2 * math.sin(-q4), l1 + l2 * math.cos(-q4))
+
+    # Redundant joints at defaults; q6 compensates the wrist for a level flange
+    return (q1, q2, 0.0, q4, 0.0, -q2 - q4, 0.0)
+
+@njit(cache=True)
+def _denorm_ik_fused(normed, mins, scales, base_height, l1, l2, out):
+    """
+    Fused denormalize -> IK kernel: one pass over an (N,3) batch of normalized
+    targets, writing (N,7) joint angles into `out`. Rows are independent.
+    """
+    for i in range(normed.shape[0]):
+        # Unpacked, not indexed: with float32 inputs the tuple mixes float32 and float64
+        q1, q2, q3, q4, q5, q6, q7 = _ik7(
+            mins[0] + normed[i, 0] * scales[0],
+            mins[1] + normed[i, 1] * scales[1],
+            mins[2] + normed[i, 2] * scales[2],
+            base_height, l1, l2
+        )
+        out[i, 0] = q1
+        out[i, 1] = q2
+        out[i, 2] = q3
+        out[i, 3] = q4
+        out[i, 4] = q5
+        out[i, 5] = q6
+        out[i, 6] = q7
+
+def workspace_affine(workspace: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Resolve workspace bounds into (mins, scales) arrays."""
+    mins = np.array([workspace[k]["min"] for k in ("x", "y", "z")], dtype=np.float64)
+    scales = np.array([workspace[k]["max"] - workspace[k]["min"] for k in ("x", "y", "z")], dtype=np.float64)
+    return mins, scales
+
+def make_denorm(workspace: Dict) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Specialize the [0,1] -> World mapping for one workspace (partial evaluation).
+    Bounds are resolved once and captured; the returned function is pure arithmetic
+    and accepts a single point or an (N,3) batch.
+    """
+    mins, scales = workspace_affine(workspace)
+
+    def denorm(pos: np.ndarray) -> np.ndarray:
+        return mins + np.asarray(pos, dtype=np.float64) * scales
+
+    return denorm
 
 class UniversalActionEncoder:
     """
     Tier 4: Deterministic Universal Mapper.
     Translates task-space waypoints into joint-space trajectories.
     """
-    def __init__(self, profiles: Dict):
+    def __init__(self, profiles: Dict, use_gpu: bool = False, dtype=np.float64):
         logging.info("Loading Tier 4: Deterministic Universal Mapper...")
         self.profiles = profiles
+        # Working precision of the batched IK buffers. float32 halves bytes moved on
+        # long batches; outputs are still rounded in float64 and returned as List[float].
+        self.dtype = np.dtype(dtype)
+        # GPU batching is opt-in: device transcendentals are not bit-identical to libm,
+        # so the default CPU path keeps plan digests stable across machines.
+        self.use_gpu = use_gpu and CUPY_AVAILABLE
+        if use_gpu and not CUPY_AVAILABLE:
+            logging.warning("GPU batching requested but CuPy not available. Using CPU.")
+        # Per-robot derived profile data (joint names, workspace affine), built on first use
+        self._profile_cache: Dict[str, Dict] = {}
+
+        # Geometric arm constants (Typical cobot arm), precomputed once
+        self._base_height = 0.2
+        self._l1, self._l2 = 0.4, 0.4
 
-    def _solve_ik(self, world_pos: List[float], profile: Dict) -> List[float]:
+    def _solve_ik_batch(self, world_pos: np.ndarray, xp=np) -> np.ndarray:
         """
-        Deterministic Geometric IK Solver for 7-DOF Manipulator.
+        Deterministic geometric IK for the 7-DOF manipulator (same math as `_ik7`)
+        over an (N,3) batch of world targets. Returns an (N,7) array of rounded
+        joint angles:
         - q1: Base Rotation (Yaw)
         - q2: Shoulder (Pitch)
         - q3: Upper Arm (Roll)
@@ -22,100 +125,139 @@ class UniversalActionEncoder:
         - q5: Forearm (Roll)
         - q6: Wrist (Pitch)
         - q7: Flange (Roll)
+        Written against the array module `xp` so the same code runs on NumPy or CuPy.
         """
-        x, y, z = world_pos
-        
-        # 1. Base Rotation
-        q1 = np.arctan2(y, x)
-        
-        # 2. Geometric Approximation for Reach
-        r = np.sqrt(x**2 + y**2)
-        h = z - 0.2 # Offset for base height
-        dist = np.sqrt(r**2 + h**2)
-        
-        # Link lengths (Typical cobot arm)
-        L1, L2 = 0.4, 0.4
+        x, y, z = xp.asarray(world_pos, dtype=self.dtype).reshape(-1, 3).T
+        L1, L2 = self._l1, self._l2
         
-        # Law of Cosines for Elbow (q4)
-        cos_q4 = (dist**2 - L1**2 - L2**2) / (2 * L1 * L2)
-        cos_q4 = np.clip(cos_q4, -1.0, 1.0)
-        q4 = -np.arccos(cos_q4)
+        r = xp.sqrt(x * x + y * y)
+        h = z - self._base_height
+        dist = xp.sqrt(r * r + h * h)
         
-        # Shoulder (q2)
-        phi1 = np.arctan2(h, r)
-        phi2 = np.arctan2(L2 * np.sin(-q4), L1 + L2 * np.cos(-q4))
-        q2 = phi1 + phi2
+        cos_q4 = xp.clip((dist * dist - L1 * L1 - L2 * L2) / (2 * L1 * L2), -1.0, 1.0)
+        q4 = -xp.arccos(cos_q4)
+        q2 = xp.arctan2(h, r) + xp.arctan2(L2 * xp.sin(-q4), L1 + L2 * xp.cos(-q4))
         
-        # Simple defaults for redundant joints (q3, q5, q6, q7)
-        q3 = 0.0
-        q5 = 0.0
-        q6 = -q2 - q4 # Wrist compensation for level flange
-        q7 = 0.0
-        
-        return [float(np.round(q, 6)) for q in [q1, q2, q3, q4, q5, q6, q7]]
+        q = xp.zeros((x.shape[0], 7), dtype=self.dtype)
+        q[:, 0] = xp.arctan2(y, x)
+        q[:, 1] = q2
+        q[:, 3] = q4
+        q[:, 5] = -q2 - q4
+        q = q.astype(xp.float64, copy=False)
+        return xp.round(q, 6, out=q)
+
+    def _solve_ik_gpu(self, world_pos: np.ndarray) -> np.ndarray:
+        """Batch IK on the GPU; one host->device and one device->host copy."""
+        return cupy.asnumpy(self._solve_ik_batch(cupy.asarray(world_pos), xp=cupy))
+
+    def _solve_ik_fused(self, normed: np.ndarray, mins: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        """
+        Denormalize + IK for an (N,3) batch of normalized targets via the fused kernel.
+        Returns an (N,7) array of rounded joint angles.
+        """
+        out = np.empty((normed.shape[0], 7), dtype=self.dtype)
+        _denorm_ik_fused(
+            np.ascontiguousarray(normed, dtype=self.dtype), mins.astype(self.dtype), scales.astype(self.dtype),
+            self._base_height, self._l1, self._l2, out
+        )
+        out = out.astype(np.float64, copy=False)
+        return np.round(out, 6, out=out)
 
-    async def map_chunks_to_robot(
+    def map_chunks_to_robot(
         self, 
-        chunks: List[Dict], 
+        chunks: Iterable[Dict], 
         robot_id: str, 
         wrist_cam, 
         overhead_cam, 
         current_joints: Dict[str, float] = None
-    ) -> List[JointTrajectoryChunk]:
+    ) -> Iterator[JointTrajectoryChunk]:
         """
         Map augmented chunks to joint trajectories deterministically.
+        Accepts a streamed input and yields one trajectory per chunk. Only the fields
+        Tier 4 reads are retained from each input chunk, so upstream payloads
+        (tactile waypoints, latents) can be released as soon as they are consumed.
         """
-        profile = self.profiles.get(robot_id, {})
-        joint_names = profile.get("joint_names", 
-            ["joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6", "joint_7"]
-        )
+        # 1. Collect Task-Space Targets (Fixed Timeline)
+        # Target is the last pt of each chunk. A chunk without waypoints has no target;
+        # dropping it would misalign the mapped plan with its input, so it is an error.
+        raw_targets = []
+        specs = []
+        for index, chunk in enumerate(chunks):
+            waypoints = chunk.get("position_waypoints")
+            if waypoints is None or len(waypoints) == 0: # list or (T,3) array view
+                raise ValueError(f"Chunk {chunk.get('id', index)} has no position waypoints to map")
+            raw_targets.append(waypoints[-1])
+            specs.append((
+                chunk.get("description", "trajectory"),
+                float(chunk.get("duration_s", 2.0)),
+                float(chunk.get("estimated_force", 0.0))
+            ))
+        if not specs:
+            return
         
-        mapped_chunks = []
-        for chunk in chunks:
-            # 1. Interpolate Task-Space Waypoints (Fixed Timeline)
-            # Input waypoints might be low density. We ensure 10 points per chunk.
-            raw_target_pos = chunk.get("position_waypoints")[-1] # Target is last pt
-            
-            workspace = profile.get("workspace", 
-                {"x": {"min":-1, "max":1}, "y": {"min":-1, "max":1}, "z": {"min":0, "max":1}}
-            )
-            world_target = self._denormalize(raw_target_pos, workspace)
-            
+        cached = self._get_profile_cache(robot_id)
+        joint_names = cached["joint_names"] # tuple; every model gets its own list copy
+        
+        # All targets are denormalized and solved in one batch
+        raw_targets = np.asarray(raw_targets, dtype=np.float64).reshape(-1, 3)
+        if self.use_gpu and len(raw_targets) >= GPU_BATCH_THRESHOLD:
+            joint_targets = self._solve_ik_gpu(cached["denorm"](raw_targets))
+        elif NUMBA_AVAILABLE:
+            # Single fused native pass: denormalize + IK per target
+            joint_targets = self._solve_ik_fused(raw_targets, *cached["affine"])
+        else:
+            joint_targets = self._solve_ik_batch(cached["denorm"](raw_targets))
+        joint_targets = joint_targets.tolist()
+        
+        # Start state is tracked positionally; the name-keyed dict is only read once here
+        start_pos = [current_joints.get(n, 0.0) for n in joint_names] if current_joints else None
+        
+        for (description, duration, max_force_est), target_joint_pos in zip(specs, joint_targets):
             # 2. Derive Joint Waypoints
+            # Inputs are generated here and already well-formed (joint count checked once
+            # per profile), so validation is skipped via model_construct; validated
+            # models stay on external boundaries.
             trajectory_waypoints = []
             
             # Start State
-            if current_joints:
-                start_pos = [current_joints.get(n, 0.0) for n in joint_names]
-                trajectory_waypoints.append(JointState(names=joint_names, positions=start_pos))
+            if start_pos is not None:
+                trajectory_waypoints.append(JointState.model_construct(names=list(joint_names), positions=start_pos))
             
-            # Target State
-            target_joint_pos = self._solve_ik(world_target, profile)
-            trajectory_waypoints.append(JointState(names=joint_names, positions=target_joint_pos))
+            # Target State (solved in batch above)
+            trajectory_waypoints.append(JointState.model_construct(names=list(joint_names), positions=target_joint_pos))
             
             # 3. Create Chunk (Ordinal and IDs will be set by pipeline)
             # Placeholder for ActionChunk fields (filled by Pipeline)
-            traj = JointTrajectoryChunk(
+            yield JointTrajectoryChunk.model_construct(
                 chunk_id="tmp", 
                 plan_id="tmp", 
                 ordinal=0,
-                description=chunk.get("description", "trajectory"),
-                joint_names=joint_names,
+                description=description,
+                joint_names=list(joint_names),
                 waypoints=trajectory_waypoints,
-                duration=chunk.get("duration_s", 2.0),
-                max_force_est=chunk.get("estimated_force", 0.0)
+                duration=duration,
+                max_force_est=max_force_est
             )
-            mapped_chunks.append(traj)
             
             # Sequential state tracking if multiple chunks
-            current_joints = {n: v for n, v in zip(joint_names, target_joint_pos)}
-            
-        return mapped_chunks
-
-    def _denormalize(self, pos: List[float], workspace: Dict) -> List[float]:
-        """Map [0,1] to World coordinates."""
-        return [
-            workspace["x"]["min"] + pos[0] * (workspace["x"]["max"] - workspace["x"]["min"]),
-            workspace["y"]["min"] + pos[1] * (workspace["y"]["max"] - workspace["y"]["min"]),
-            workspace["z"]["min"] + pos[2] * (workspace["z"]["max"] - workspace["z"]["min"])
-        ]
+            start_pos = list(target_joint_pos)
+
+    def _get_profile_cache(self, robot_id: str) -> Dict:
+        """Resolve robot-invariant profile data once per robot_id."""
+        cached = self._profile_cache.get(robot_id)
+        if cached is None:
+            profile = self.profiles.get(robot_id, {})
+            workspace = profile.get("workspace", DEFAULT_WORKSPACE)
+            joint_names = tuple(profile.get("joint_names", DEFAULT_JOINT_NAMES))
+            # Trajectory waypoints are built unvalidated, so their alignment is enforced here
+            if len(joint_names) != IK_JOINT_COUNT:
+                raise ValueError(
+                    f"Robot {robot_id} has {len(joint_names)} joint names; IK solves {IK_JOINT_COUNT} joints"
+                )
+            cached = {
+                "joint_names": joint_names,
+                "affine": workspace_affine(workspace),
+                "denorm": make_denorm(workspace)
+            }
+            self._profile_cache[robot_id] = cached
+        return cached
@@ -1,8 +1,28 @@
 import numpy as np
 import logging
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from itertools import repeat
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 from mcp_robot.runtime.determinism import StableHasher
 
+# Shared read-only fallback for chunks whose target is not in the perception snapshot
+DEFAULT_TARGET_OBJECT = MappingProxyType({"type": "default", "mass": 0.2, "friction_coefficient": 0.5})
+
+@dataclass(slots=True)
+class TactileWaypoint:
+    """
+    Per-waypoint tactile guidance (internal Tier 3 -> Tier 4 hand-off).
+    Slotted: one of these is created per waypoint, so no per-instance __dict__.
+    """
+    position: List[float]
+    grip_force_n: float
+    predicted_friction: float
+    slip_threshold: float
+    monitor_tactile: bool
+    predicted_zmp: Tuple[float, float] # (x, y) shift from support polygon center
+    slip_recovery: str = "automatic_force_increase"
+
 class VisioTactileActionEncoder:
     """
     Tier 3: Deterministic Action Encoding.
@@ -14,65 +34,101 @@ class VisioTactileActionEncoder:
         self.robot_profile = robot_profile
         self.tactile_db = tactile_db
     
-    async def augment_chunks_with_tactile(
+    def augment_chunks_with_tactile(
         self,
-        chunks: List[Dict],
+        chunks: Iterable[Dict],
         camera_frame: Optional[np.ndarray],
         detected_objects: List[Dict],
-        current_tactile: Dict
-    ) -> List[Dict]:
+        current_tactile: Dict,
+        include_waypoints: bool = True
+    ) -> Iterator[Dict]:
         """
         Augment action chunks with tactile guidance based on PerceptionSnapshot.
+        Yields augmented chunks one at a time. With include_waypoints=False only
+        chunk-level flags are attached, the per-waypoint guidance (the bulk of the
+        work) is skipped and chunks stream straight through. Otherwise the input is
+        gathered first, since the guidance is computed in one batch over all chunks.
         """
-        augmented_chunks = []
+        if not include_waypoints:
+            for chunk in chunks:
+                yield {**chunk, "is_tactile_critical": chunk["criticality"] in ("high", "medium")}
+            return
         
+        chunks = list(chunks) # read twice below; accepts any iterable
+        
+        # Index detected objects by type once (first detection of a type wins)
+        objects_by_type: Dict[str, Dict] = {}
+        for obj in detected_objects:
+            objects_by_type.setdefault(obj.get("type"), obj)
+        
+        # 1. Per-chunk invariants: target object, friction and safe grip force.
+        # These depend only on the target name, so each distinct target is derived once.
+        # The same pass collects every chunk's (T,3) waypoint block (lists or array views)
+        # for the batched transform below.
+        profile_by_target: Dict[str, Tuple[float, float]] = {}
+        tactile_profiles = []
+        waypoint_blocks = []
         for chunk in chunks:
-            # 1. Resolve Target Object Deterministically
-            target_obj = self._resolve_target(chunk, detected_objects)
-            
-            # 2. Derive Tactile Profile
-            # Note: Friction/Slip parameters are derived from targeted object metadata
-            friction = target_obj.get("friction_coefficient", 0.5)
-            mass = target_obj.get("mass", 0.2)
-            
-            waypoints = chunk["position_waypoints"]
-            tactile_waypoints = []
-            
-            for wp in waypoints:
-                # 3. Compute Safe Grip Force (Deterministic Formula)
-                grip_force = self._calculate_grip_force(mass, friction)
+            waypoint_blocks.append(np.asarray(chunk["position_waypoints"], dtype=np.float64).reshape(-1, 3))
+            target_name = chunk.get("target_object", "unknown")
+            tactile_profile = profile_by_target.get(target_name)
+            if tactile_profile is None:
+                # Resolve Target Object Deterministically
+                target_obj = self._resolve_target(chunk, objects_by_type)
                 
-                # 4. Predict ZMP Shift (Deterministic Kinematic Approximation)
-                # Waypoint [x, y, z] normalized. Support polygon center at 0.5, 0.5
-                zmp = {
-                    "x": round((wp[0] - 0.5) * 0.1, 4),
-                    "y": round((wp[1] - 0.5) * 0.1, 4)
-                }
-
-                tactile_waypoints.append({
-                    "position": wp,
-                    "grip_force_n": grip_force,
-                    "predicted_friction": friction,
-                    "slip_threshold": round(grip_force * 0.2, 4),
-                    "slip_recovery": "automatic_force_increase",
-                    "monitor_tactile": chunk["criticality"] == "high",
-                    "predicted_zmp": zmp
-                })
-            
-            augmented_chunk = chunk.copy()
-            augmented_chunk["tactile_waypoints"] = tactile_waypoints
-            augmented_chunk["is_tactile_critical"] = chunk["criticality"] in ["high", "medium"]
-            augmented_chunks.append(augmented_chunk)
+                # Note: Friction/Slip parameters are derived from targeted object metadata
+                friction = target_obj.get("friction_coefficient", 0.5)
+                mass = target_obj.get("mass", 0.2)
+                tactile_profile = (friction, self._calculate_grip_force(mass, friction))
+                profile_by_target[target_name] = tactile_profile
+            tactile_profiles.append(tactile_profile)
         
-        return augmented_chunks
+        # 2. One arithmetic pass for the whole batch:
+        # slip thresholds for every chunk, then the predicted ZMP shift of every waypoint.
+        # Waypoint [x, y, z] normalized. Support polygon center at 0.5, 0.5
+        # Rounding uses Python round(): np.round differs from it on ties.
+        all_waypoints = np.concatenate(waypoint_blocks) if waypoint_blocks else np.empty((0, 3))
+        n_chunks = len(tactile_profiles)
+        raw = np.concatenate((
+            np.asarray([gf for _, gf in tactile_profiles], dtype=np.float64).reshape(-1) * 0.2,
+            ((all_waypoints[:, :2] - 0.5) * 0.1).ravel()
+        )).tolist()
+        rounded = list(map(round, raw, repeat(4, len(raw))))
+        slip_thresholds = rounded[:n_chunks]
+        
+        # 3. Assemble and stream tactile waypoints per chunk
+        # (x, y) pairs are consumed in order; zip stops at each chunk's waypoint count
+        zmp_flat = iter(rounded[n_chunks:])
+        zmp_rows = zip(zmp_flat, zmp_flat)
+        for chunk, block, (friction, grip_force), slip_threshold in zip(
+            chunks, waypoint_blocks, tactile_profiles, slip_thresholds
+        ):
+            waypoints = block.tolist() # tactile guidance carries plain [x, y, z] lists
+            criticality = chunk["criticality"]
+            monitor_tactile = criticality == "high"
+            
+            tactile_waypoints = [
+                TactileWaypoint(
+                    position=wp,
+                    grip_force_n=grip_force,
+                    predicted_friction=friction,
+                    slip_threshold=slip_threshold,
+                    monitor_tactile=monitor_tactile,
+                    predicted_zmp=(zmp_x, zmp_y)
+                )
+                for wp, (zmp_x, zmp_y) in zip(waypoints, zmp_rows)
+            ]
+            
+            # Single merged build: Tier 4 still reads planner fields (duration_s, estimated_force)
+            yield {
+                **chunk,
+                "tactile_waypoints": tactile_waypoints,
+                "is_tactile_critical": criticality in ("high", "medium")
+            }
     
-    def _resolve_target(self, chunk: Dict, detected_objects: List[Dict]) -> Dict:
-        """Find the targeted object in the perception snapshot."""
-        target_name = chunk.get("target_object", "unknown")
-        for obj in detected_objects:
-            if obj.get("type") == target_name:
-                return obj
-        return {"type": "default", "mass": 0.2, "friction_coefficient": 0.5}
+    def _resolve_target(self, chunk: Dict, objects_by_type: Dict[str, Dict]) -> Mapping:
+        """Find the targeted object in the perception snapshot (indexed by type)."""
+        return objects_by_type.get(chunk.get("target_object", "unknown"), DEFAULT_TARGET_OBJECT)
 
     def _calculate_grip_force(self, mass_kg: float, friction: float) -> float:
         """Safe grip force formula: F = (m*g / mu * n_fingers) * safety_factor"""
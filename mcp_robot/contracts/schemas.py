@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 from typing import List, Dict, Optional, Any
 import time
+import numpy as np
 
 SCHEMA_VERSION = "2.0.0"
 
@@ -80,6 +81,21 @@ class JointTrajectoryChunk(ActionChunk):
     duration: float # Expected seconds to complete
     max_force_est: float = 0.0
     stability_score: float = 1.0
+    # Digest of the Tier-4 payload, recorded once when the plan is finalized.
+    # Private: not serialized, so it never feeds back into chunk or plan digests.
+    _payload_digest: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def payload_digest(self) -> Optional[str]:
+        """Digest of the trajectory payload this chunk's id was derived from."""
+        return self._payload_digest
+
+    def positions_matrix(self, dtype=np.float64) -> np.ndarray:
+        """
+        Waypoint positions as one contiguous (N, J) array (structure-of-arrays view).
+        Built on demand, so the serialized model and its digests are unaffected.
+        """
+        return np.array([wp.positions for wp in self.waypoints], dtype=dtype).reshape(len(self.waypoints), -1)
 
 class CartesianServoChunk(ActionChunk):
     """End-effector servo command."""
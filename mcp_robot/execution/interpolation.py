@@ -0,0 +1,51 @@
+"""
+Dense servo-target interpolation for Tier 6.
+Expands a chunk's sparse joint waypoints into evenly timed controller setpoints.
+"""
+import math
+import numpy as np
+from typing import Sequence, Tuple
+from mcp_robot.runtime.jit import njit
+
+@njit(cache=True)
+def interp_linear(wp_times, wp_pos, out_times, out_pos):
+    """
+    Piecewise-linear interpolation of (N,J) waypoints onto `out_times`, written into
+    the preallocated (T,J) `out_pos`. Output times must be non-decreasing, so the
+    segment cursor only moves forward.
+    """
+    n = wp_times.shape[0]
+    n_joints = wp_pos.shape[1]
+    seg = 0
+    for t in range(out_times.shape[0]):
+        if n == 1:
+            for j in range(n_joints):
+                out_pos[t, j] = wp_pos[0, j]
+            continue
+        tt = out_times[t]
+        while seg < n - 2 and tt > wp_times[seg + 1]:
+            seg += 1
+        span = wp_times[seg + 1] - wp_times[seg]
+        a = (tt - wp_times[seg]) / span if span > 0.0 else 1.0
+        if a < 0.0:
+            a = 0.0
+        elif a > 1.0:
+            a = 1.0
+        for j in range(n_joints):
+            p0 = wp_pos[seg, j]
+            out_pos[t, j] = p0 + a * (wp_pos[seg + 1, j] - p0)
+
+def densify_waypoints(
+    positions: Sequence[Sequence[float]], duration: float, rate_hz: float, dtype=np.float32
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample waypoints (evenly spaced over `duration`) at `rate_hz`.
+    Returns (times (T,), positions (T,J)) as contiguous arrays in `dtype`.
+    """
+    wp_pos = np.ascontiguousarray(positions, dtype=dtype).reshape(len(positions), -1)
+    wp_times = np.linspace(0.0, duration, wp_pos.shape[0]).astype(dtype)
+    n_out = max(2, int(math.ceil(duration * rate_hz)) + 1)
+    out_times = np.linspace(0.0, duration, n_out).astype(dtype)
+    out_pos = np.empty((n_out, wp_pos.shape[1]), dtype=dtype)
+    interp_linear(wp_times, wp_pos, out_times, out_pos)
+    return out_times, out_pos
@@ -1,12 +1,16 @@
 import logging
+import os
+import tempfile
 import time
-from typing import Optional, Any, Dict
+from contextlib import contextmanager
+from typing import Optional, Any, Dict, Iterator
 
 # Try importing ROS2 libraries
 try:
     import rclpy
     from rclpy.node import Node
     from rclpy.action import ActionClient
+    from rclpy.executors import SingleThreadedExecutor
     from rclpy.qos import QoSProfile, QoSReliabilityPolicy, QoSHistoryPolicy, QoSDurabilityPolicy
     from control_msgs.action import FollowJointTrajectory
     from trajectory_msgs.msg import JointTrajectoryPoint
@@ -14,8 +18,10 @@ try:
     ROS_AVAILABLE = True
 except ImportError:
     ROS_AVAILABLE = False
+    rclpy = None
     # Mock classes for Type Hinting / Sim Mode
     class Node: pass
+    class SingleThreadedExecutor: pass
     class QoSProfile: 
         def __init__(self, **kwargs): pass
     class QoSReliabilityPolicy:
@@ -65,6 +71,54 @@ def get_production_qos(reliability: str = "RELIABLE") -> QoSProfile:
             depth=10
         )
 
+FLOW_CONTROLLER_XML = """<?xml version="1.0" encoding="UTF-8" ?>
+<profiles xmlns="http://www.eprosima.com/XMLSchemas/fastRTPS_Profiles">
+  <participant profile_name="mcp_robot_participant" is_default_profile="true">
+    <rtps>
+      <flow_controller_descriptor_list>
+        <flow_controller_descriptor>
+          <name>mcp_robot_flow</name>
+          <scheduler>FIFO</scheduler>
+          <max_bytes_per_period>{max_bytes}</max_bytes_per_period>
+          <period_ms>{period_ms}</period_ms>
+        </flow_controller_descriptor>
+      </flow_controller_descriptor_list>
+    </rtps>
+  </participant>
+  <data_writer profile_name="mcp_robot_writer" is_default_profile="true">
+    <qos>
+      <publishMode>
+        <kind>ASYNCHRONOUS</kind>
+        <flow_controller_name>mcp_robot_flow</flow_controller_name>
+      </publishMode>
+    </qos>
+  </data_writer>
+</profiles>
+"""
+
+@contextmanager
+def flow_controller_profile(max_bytes_per_period: int, period_ms: int = 10) -> Iterator[str]:
+    """
+    Rate-limit outbound Fast-DDS traffic so large trajectory goals are sent as
+    spaced fragments instead of one UDP burst. rclpy.init() and node creation
+    must run inside the block; the temporary profiles file is removed on exit.
+    Only the default participant/writer profiles are set, so QoS chosen in code
+    (e.g. get_production_qos) still applies. A profiles file already set by the
+    user always wins. Yields the file in effect.
+    """
+    if "FASTRTPS_DEFAULT_PROFILES_FILE" in os.environ:
+        yield os.environ["FASTRTPS_DEFAULT_PROFILES_FILE"]
+        return
+    
+    with tempfile.NamedTemporaryFile("w", suffix="_fastdds.xml", delete=False) as f:
+        f.write(FLOW_CONTROLLER_XML.format(max_bytes=int(max_bytes_per_period), period_ms=int(period_ms)))
+    os.environ["FASTRTPS_DEFAULT_PROFILES_FILE"] = f.name
+    try:
+        yield f.name
+    finally:
+        os.environ.pop("FASTRTPS_DEFAULT_PROFILES_FILE", None)
+        os.remove(f.name)
+
 def to_ros_duration(seconds: float) -> Any:
     """Converts float seconds to builtin_interfaces.msg.Duration"""
     if not ROS_AVAILABLE: return None
@@ -83,7 +137,12 @@ class ROSActionWrapper:
         self.client = None
         
         if ROS_AVAILABLE:
-            self.client = ActionClient(node, action_type, action_name)
+            # Goal/result services stay RELIABLE; the high-rate feedback stream only
+            # needs the latest sample, so it rides BEST_EFFORT with depth=1.
+            self.client = ActionClient(
+                node, action_type, action_name,
+                feedback_sub_qos_profile=get_production_qos("BEST_EFFORT")
+            )
     
     def wait_for_server(self, timeout_sec: float = 5.0) -> bool:
         if not self.client: return False
@@ -1,87 +1,175 @@
 import asyncio
 import logging
-from typing import Dict, Optional
+import threading
+from contextlib import nullcontext
+import numpy as np
+from typing import Any, Dict, Optional
 from mcp_robot.contracts.schemas import JointTrajectoryChunk
 from mcp_robot.execution.ros_helpers import (
-    ROS_AVAILABLE, Node, ROSActionWrapper, to_ros_duration,
-    FollowJointTrajectory, JointTrajectoryPoint
+    ROS_AVAILABLE, rclpy, Node, SingleThreadedExecutor, ROSActionWrapper, to_ros_duration,
+    flow_controller_profile, FollowJointTrajectory, JointTrajectoryPoint
 )
+from mcp_robot.execution.interpolation import densify_waypoints
 from mcp_robot.runtime.determinism import global_clock
 
+logger = logging.getLogger(__name__)
+
+# Process-wide ROS2 node + executor, shared by every adapter.
+# DDS participant creation and discovery are paid once per process, not per pipeline.
+_SHARED_NODE = None
+_SHARED_EXECUTOR = None
+_SHARED_LOCK = threading.Lock()
+
+def _get_shared_node(flow_control_bytes_per_10ms: Optional[int] = None):
+    """Create (once) and return the shared node, spun by a daemon executor thread."""
+    global _SHARED_NODE, _SHARED_EXECUTOR
+    with _SHARED_LOCK:
+        if _SHARED_NODE is None:
+            # A flow controller can only be attached to a participant we create here
+            use_profile = flow_control_bytes_per_10ms and not rclpy.ok()
+            profile = flow_controller_profile(flow_control_bytes_per_10ms) if use_profile else nullcontext()
+            with profile:
+                if not rclpy.ok():
+                    rclpy.init()
+                _SHARED_NODE = Node("mcp_robot_shared")
+            
+            _SHARED_EXECUTOR = SingleThreadedExecutor()
+            _SHARED_EXECUTOR.add_node(_SHARED_NODE)
+            threading.Thread(target=_SHARED_EXECUTOR.spin, daemon=True).start()
+        return _SHARED_NODE, _SHARED_EXECUTOR
+
+async def _await_rcl_future(rcl_future, loop: asyncio.AbstractEventLoop):
+    """
+    Await an rclpy Future from asyncio on `loop` (the caller's running loop).
+    The shared executor thread completes the future; the result is handed to the
+    event loop thread-safely (no polling).
+    """
+    aio_future = loop.create_future()
+    
+    def _resolve(fut):
+        if aio_future.done():
+            return
+        exc = fut.exception()
+        if exc is not None:
+            aio_future.set_exception(exc)
+        else:
+            aio_future.set_result(fut.result())
+    
+    rcl_future.add_done_callback(lambda fut: loop.call_soon_threadsafe(_resolve, fut))
+    return await aio_future
+
 class ROS2Adapter:
     """
     Tier 6: Deterministic Execution Bridge.
     Supports HARDWARE (rclpy) and SIM (Deterministic Tick) modes.
     """
     
-    def __init__(self, robot_id: str, execution_mode: str = "SIM"):
+    def __init__(
+        self,
+        robot_id: str,
+        execution_mode: str = "SIM",
+        servo_rate_hz: Optional[float] = None,
+        flow_control_bytes_per_10ms: Optional[int] = None
+    ):
         self.robot_id = robot_id
         self.mode = execution_mode
+        # Optional DDS outbound rate cap (e.g. 30000 ~= 3 MB/s) for large trajectory goals
+        self.flow_control_bytes_per_10ms = flow_control_bytes_per_10ms
+        # When set, HARDWARE goals carry dense setpoints at this rate instead of raw waypoints
+        self.servo_rate_hz = servo_rate_hz
         self.node = None
         self.trajectory_client = None
         
-        logging.info(f"[Tier 6] Initializing ROS2Adapter in {self.mode} mode.")
+        logger.info("[Tier 6] Initializing ROS2Adapter in %s mode.", self.mode)
         
         if self.mode == "HARDWARE" and ROS_AVAILABLE:
             self._init_ros_node()
         elif self.mode == "HARDWARE":
-            logging.warning("HARDWARE mode requested but ROS2 not available. Falling back to SIM.")
+            logger.warning("HARDWARE mode requested but ROS2 not available. Falling back to SIM.")
             self.mode = "SIM"
 
     def _init_ros_node(self):
-        """Initialize real ROS2 infrastructure."""
-        import rclpy
-        from rclpy.executors import SingleThreadedExecutor
-        
-        if not rclpy.ok():
-            rclpy.init()
-            
-        self.node = Node(f"mcp_robot_adapter_{self.robot_id}")
+        """Initialize real ROS2 infrastructure (on the process-wide shared node)."""
+        self.node, self.executor = _get_shared_node(self.flow_control_bytes_per_10ms)
         self.trajectory_client = ROSActionWrapper(
             self.node, 
             FollowJointTrajectory, 
             "/joint_trajectory_controller/follow_joint_trajectory"
         )
-        self.executor = SingleThreadedExecutor()
-        self.executor.add_node(self.node)
 
-    async def execute_trajectory(self, trajectory: JointTrajectoryChunk) -> Dict:
+    async def execute_trajectory(self, trajectory: JointTrajectoryChunk, prepared: Any = None) -> Dict:
         """
         Main execution entrypoint.
+        `prepared` is the result of an earlier `prepare(trajectory)`, if the caller ran one.
         """
         if self.mode == "SIM":
-            return self._simulate_execution(trajectory)
+            return self.simulate_execution(trajectory)
         else:
-            return await self._execute_hardware(trajectory)
+            if prepared is None:
+                prepared = await self.prepare(trajectory)
+            return await self._execute_hardware(prepared)
 
-    async def _execute_hardware(self, trajectory: JointTrajectoryChunk) -> Dict:
-        """Real ROS2 Action Call with proper awaiting."""
-        if not self.trajectory_client.wait_for_server(timeout_sec=5.0):
+    async def prepare(self, trajectory: JointTrajectoryChunk) -> Any:
+        """
+        Dispatch setup that does not depend on the safety verdict, so callers can
+        overlap it with Tier 5: waits for the action server (off the event loop) and
+        builds the goal. Returns None in SIM mode, where there is nothing to set up.
+        """
+        if self.mode == "SIM":
+            return None
+        ready = await asyncio.to_thread(self.trajectory_client.wait_for_server, timeout_sec=5.0)
+        if not ready:
             return {"success": False, "error_code": -1, "reason": "Action Server Timeout"}
-            
+        return self._build_goal(trajectory)
+
+    def _build_goal(self, trajectory: JointTrajectoryChunk):
+        """
+        FollowJointTrajectory goal for a chunk (dense setpoints or raw waypoints).
+        Every goal owns fresh point messages: goals are built before their verdict
+        is known and may wait to be sent while other goals are built.
+        """
         goal_msg = FollowJointTrajectory.Goal()
         goal_msg.trajectory.joint_names = trajectory.joint_names
         
-        # Mapping all waypoints to ROS points
-        for wp in trajectory.waypoints:
-            point = JointTrajectoryPoint()
-            point.positions = wp.positions
-            # Use chunk duration as total time for this simplified mapping
-            point.time_from_start = to_ros_duration(trajectory.duration)
-            goal_msg.trajectory.points.append(point)
-        
-        logging.info(f"[Tier 6] Sending goal to hardware...")
+        if self.servo_rate_hz:
+            # Dense, evenly timed setpoints from one native interpolation pass
+            times, positions = densify_waypoints(
+                trajectory.positions_matrix(np.float32), trajectory.duration, self.servo_rate_hz
+            )
+            points = [JointTrajectoryPoint() for _ in range(len(times))]
+            for point, t, row in zip(points, times.tolist(), positions.tolist()):
+                point.positions = row
+                point.time_from_start = to_ros_duration(t)
+        else:
+            # Mapping all waypoints to ROS points
+            # Use chunk duration as total time for this simplified mapping.
+            # One immutable Duration is shared; it is only read when the goal is serialized.
+            duration_msg = to_ros_duration(trajectory.duration)
+            points = [JointTrajectoryPoint() for _ in trajectory.waypoints]
+            for point, wp in zip(points, trajectory.waypoints):
+                point.positions = wp.positions
+                point.time_from_start = duration_msg
+        goal_msg.trajectory.points = points
+        return goal_msg
+
+    async def _execute_hardware(self, prepared: Any) -> Dict:
+        """Real ROS2 Action Call with proper awaiting."""
+        if isinstance(prepared, dict): # setup failed (e.g. server timeout)
+            return prepared
+        goal_msg = prepared
+
+        logger.info("[Tier 6] Sending goal to hardware...")
         
-        # Actual rclpy-asyncio bridge
-        # send_goal_async returns a future
+        # rclpy futures are bridged onto the event loop; the shared executor drives them
+        loop = asyncio.get_running_loop()
         send_goal_future = self.trajectory_client.client.send_goal_async(goal_msg)
-        goal_handle = await send_goal_future
+        goal_handle = await _await_rcl_future(send_goal_future, loop)
         
         if not goal_handle.accepted:
             return {"success": False, "reason": "Goal Rejected by ROS Controller"}
             
         result_future = goal_handle.get_result_async()
-        result = await result_future
+        result = await _await_rcl_future(result_future, loop)
         
         return {
             "success": result.status == 4, # 4 = SUCCEEDED in action_msgs
@@ -89,13 +177,14 @@ class ROS2Adapter:
             "reason": "Hardware Execution Complete"
         }
 
-    def _simulate_execution(self, trajectory: JointTrajectoryChunk) -> Dict:
+    def simulate_execution(self, trajectory: JointTrajectoryChunk) -> Dict:
         """
         Deterministic SIM Execution.
         - NO asyncio.sleep (no wall-clock dependency).
+        - Synchronous: callers already on the SIM path can skip the coroutine round-trip.
         - State is updated instantaneously in the Digital Twin by the Pipeline.
         """
-        logging.info(f"[Tier 6] [SIM] Deterministic Step: {trajectory.chunk_id}")
+        logger.debug("[Tier 6] [SIM] Deterministic Step: %s", trajectory.chunk_id)
         
         return {
             "success": True, 
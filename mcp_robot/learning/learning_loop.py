@@ -1,7 +1,10 @@
 
-import time
 from typing import Dict, Any
 import numpy as np
+from mcp_robot.runtime.determinism import global_clock
+
+# Mock object identification result (constant, shared across telemetry records)
+MOCK_TARGET_TYPE = "cube"
 
 class LearningLoop:
     """
@@ -25,24 +28,31 @@ class LearningLoop:
         Learn from execution to improve future predictions.
         """
         
-        # Extract actual outcome
+        # Extract actual outcome.
+        # Columnar logs ({"event": [...], "time": [...], ...}) count in C via list.count;
+        # row-wise logs (list of event dicts) are still accepted.
         actual_tactile_events = execution_log.get("tactile_events", [])
+        if isinstance(actual_tactile_events, dict):
+            slip_events = list(actual_tactile_events.get("event", ())).count("slip_detected")
+        else:
+            slip_events = sum(1 for e in actual_tactile_events if e["event"] == "slip_detected")
         
         # Identify object (Mock)
-        target_object = {"type": "cube"}
+        target_type = MOCK_TARGET_TYPE
         
         # Update tactile database
         updates = {
-            "object_type": target_object["type"],
-            "actual_slip_events": len([e for e in actual_tactile_events if e["event"] == "slip_detected"]),
+            "object_type": target_type,
+            "actual_slip_events": slip_events,
             "predicted_slip_probability": 0.1,
             "execution_success": execution_log.get("success", False),
-            "timestamp": time.time()
+            # Shared deterministic clock: one read, frozen in SIM/tests instead of a wall-clock syscall
+            "timestamp": global_clock.now()
         }
         
         # Update model (In-memory mock DB update)
         if hasattr(self.tactile_db, "update"): # If it's a dict-like object
-             self.tactile_db.setdefault(target_object["type"], []).append(updates)
+             self.tactile_db.setdefault(target_type, []).append(updates)
         elif isinstance(self.tactile_db, list):
              self.tactile_db.append(updates)
         
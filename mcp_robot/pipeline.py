@@ -1,9 +1,14 @@
 import asyncio
+import hashlib
 import logging
+from collections import deque
+from itertools import islice
 from typing import Dict, List, Optional
 import numpy as np
 
 from mcp_robot.runtime.determinism import StableHasher, DeterminismConfig, global_clock
+from mcp_robot.runtime.fastjson import dumps_compact
+from mcp_robot.runtime.lru import LRUCache
 from mcp_robot.contracts.schemas import (
     RobotStateSnapshot, PerceptionSnapshot, ActionChunk, JointTrajectoryChunk, TaskPlan
 )
@@ -15,7 +20,22 @@ from mcp_robot.verification.verification_engine import VerificationEngine
 from mcp_robot.execution.ros_interface import ROS2Adapter
 from mcp_robot.learning.learning_loop import LearningLoop
 from mcp_robot.simulation.kinematic_sim import KinematicSimulator
-from mcp_robot.verification.physics_engine import PhysicsEngine
+
+logger = logging.getLogger(__name__)
+
+# Bound for the long-running plan cache (plans hold every chunk's waypoints).
+# Execution results live and die with their plan.
+MAX_ACTIVE_PLANS = 1024
+MAX_EXECUTION_LOG = 10_000
+
+# Canonical JSON of {"plan_id", "ordinal", "payload_digest"} (keys sorted, compact).
+# Both digests are hex, so no escaping is needed and the text can be formatted directly.
+_CHUNK_ID_TEMPLATE = '{"ordinal":%d,"payload_digest":"%s","plan_id":"%s"}'
+
+def _chunk_id(plan_id: str, ordinal: int, payload_digest: str) -> str:
+    """Same digest as StableHasher.sha256_stream of the chunk-id dict, without the walk."""
+    text = _CHUNK_ID_TEMPLATE % (ordinal, payload_digest, plan_id)
+    return hashlib.sha256(text.encode("ascii")).hexdigest()
 
 class MRCPUnifiedPipeline:
     """
@@ -23,10 +43,12 @@ class MRCPUnifiedPipeline:
     Strictly deterministic: Input Snapshots -> Verified Action Chunks.
     """
     
-    def __init__(self, robot_id: str, config: Optional[DeterminismConfig] = None):
+    def __init__(self, robot_id: str, config: Optional[DeterminismConfig] = None, log_path: Optional[str] = None):
         self.robot_id = robot_id
-        self.config = config or DeterminismConfig()
-        self.lock = asyncio.Lock()
+        self.config = config or DeterminismConfig() # also caches the config digest
+        # Planning locks are per plan_id; execution drives one robot, so it stays serialized
+        self._plan_locks: Dict[str, asyncio.Lock] = {}
+        self._exec_lock = asyncio.Lock()
         
         # Robot Specific Profile (Stable)
         self.robot_profile = {
@@ -50,8 +72,63 @@ class MRCPUnifiedPipeline:
         self.tier6_bridge = ROS2Adapter(robot_id, execution_mode="SIM")
         self.tier7_learner = LearningLoop({})
         
-        self.active_plans: Dict[str, TaskPlan] = {}
+        # Plans are pure functions of their inputs, so repeated inputs reuse the stored plan.
+        # Disable to force Tier 1-4 to re-run (e.g. when benchmarking the planner).
+        self.plan_cache_enabled = True
+        
+        # Bounded LRUs: a long-running server must not accumulate plans forever
+        self.active_plans: Dict[str, TaskPlan] = LRUCache(MAX_ACTIVE_PLANS, on_evict=self._forget_plan)
         self.execution_results: Dict[str, Dict] = {} # Idempotency cache
+        # plan_id -> {chunk_id -> chunk}; evicted together with its plan
+        self._chunk_index: Dict[str, Dict[str, JointTrajectoryChunk]] = {}
+        # plan_id -> exec_ids recorded for it; their results are evicted with the plan
+        self._plan_exec_ids: Dict[str, List[str]] = {}
+        
+        # Optional append-only execution log (NDJSON, one record per executed chunk).
+        # Opened once; each record costs O(1) instead of rewriting the whole history.
+        self._log_fp = open(log_path, "ab", buffering=1 << 16) if log_path else None
+        # In-memory tail of the same records, oldest first (bounded; see recent_executions)
+        self.execution_log: deque = deque(maxlen=MAX_EXECUTION_LOG)
+
+    @property
+    def config(self) -> DeterminismConfig:
+        return self._config
+
+    @config.setter
+    def config(self, value: DeterminismConfig):
+        """Replacing the config re-derives its digest (hashed once, not per task)."""
+        self._config = value
+        self._config_digest = StableHasher.sha256_stream(value.model_dump())
+
+    def _forget_plan(self, plan_id: str, plan: TaskPlan):
+        """Drop an evicted plan's chunk index and execution results."""
+        self._chunk_index.pop(plan_id, None)
+        for exec_id in self._plan_exec_ids.pop(plan_id, ()):
+            self.execution_results.pop(exec_id, None)
+
+    def _record_result(self, plan_id: str, exec_id: str, result: Dict) -> Dict:
+        """Cache an execution result (while its plan is active) and append it to the execution log."""
+        exec_ids = self._plan_exec_ids.get(plan_id)
+        if exec_ids is not None: # the plan may have been evicted while the chunk ran
+            self.execution_results[exec_id] = result
+            exec_ids.append(exec_id)
+        record = {"exec_id": exec_id, **result}
+        self.execution_log.append(record)
+        if self._log_fp is not None:
+            self._log_fp.write(dumps_compact(record) + b"\n")
+        return result
+
+    def recent_executions(self, n: int = 200) -> List[Dict]:
+        """The last `n` execution records, oldest first (walks only those `n`)."""
+        tail = list(islice(reversed(self.execution_log), max(0, n)))
+        tail.reverse()
+        return tail
+
+    def close(self):
+        """Flush and close the execution log, if any."""
+        if self._log_fp is not None:
+            self._log_fp.close()
+            self._log_fp = None
 
     async def process_task(
         self, 
@@ -64,117 +141,153 @@ class MRCPUnifiedPipeline:
         Input: Instruction + environment snapshots.
         Output: Fully formed, hashed TaskPlan.
         """
-        async with self.lock:
-            # 1. Deterministic ID Generation
-            input_dict = {
-                "instruction": instruction,
-                "perception": perception.model_dump(),
-                "state": state.model_dump()
-            }
-            input_digest = StableHasher.sha256_json(input_dict)
-            config_digest = StableHasher.sha256_json(self.config.model_dump())
-            
-            plan_id = StableHasher.sha256_json({
-                "input_digest": input_digest,
-                "config_digest": config_digest,
-                "schema_version": state.schema_version
-            })
+        use_cache = self.plan_cache_enabled
+        
+        # 1. Deterministic ID Generation
+        input_dict = {
+            "instruction": instruction,
+            "perception": perception.model_dump(),
+            "state": state.model_dump()
+        }
+        input_digest = StableHasher.sha256_stream(input_dict)
+        config_digest = self._config_digest
+        
+        plan_id = StableHasher.sha256_stream({
+            "input_digest": input_digest,
+            "config_digest": config_digest,
+            "schema_version": state.schema_version
+        })
+
+        # Fast path: already planned (no lock, no await)
+        if use_cache and plan_id in self.active_plans:
+            logger.debug("[Pipeline] Plan cache hit %s", plan_id)
+            return self.active_plans[plan_id]
 
-            if plan_id in self.active_plans:
+        # Only requests for the same plan_id contend; unrelated tasks plan concurrently
+        plan_lock = self._plan_locks.setdefault(plan_id, asyncio.Lock())
+        async with plan_lock:
+            if use_cache and plan_id in self.active_plans:
                 return self.active_plans[plan_id]
 
-            logging.info(f"[Pipeline] Planning {plan_id} for '{instruction}'")
-
-            # TIER 1: Decompose
-            subtasks = await self.tier1_decomposer.decompose_task(
-                task_instruction=instruction,
-                vision_frame=None, 
-                detected_objects=perception.detected_objects
-            )
-
-            # TIER 2: Long-Horizon Plan
-            plan_result = await self.tier2_planner.plan_action_chunks(
-                subtasks=subtasks,
-                current_frame=None, 
-                robot_state=state.model_dump(),
-                task_instruction=instruction
-            )
-
-            # TIER 3/4: Encode & Map
-            raw_chunks = plan_result["chunks"]
-            vision_context = perception.camera_frame_digest
-            
-            augmented_chunks = await self.tier3_encoder.augment_chunks_with_tactile(
-                raw_chunks, None, perception.detected_objects, perception.tactile_summary
-            )
-            
-            traj_objects = await self.tier4_mapper.map_chunks_to_robot(
-                augmented_chunks, self.robot_id, None, None, current_joints=state.to_ordered_dict()
-            )
-
-            # 2. Finalize Chunk IDs deterministically
-            final_chunks = []
-            for i, traj in enumerate(traj_objects):
-                chunk_id = StableHasher.sha256_json({
-                    "plan_id": plan_id,
-                    "ordinal": i,
-                    "payload_digest": StableHasher.sha256_json(traj.model_dump())
-                })
-                traj.chunk_id = chunk_id
-                traj.plan_id = plan_id
-                traj.ordinal = i
-                traj.timestamp = global_clock.now()
-                final_chunks.append(traj)
-
-            plan = TaskPlan(
-                plan_id=plan_id,
-                instruction=instruction,
-                input_digest=input_digest,
-                config_digest=config_digest,
-                chunks=final_chunks,
-                created_at=global_clock.now()
-            )
+            try:
+                logger.info("[Pipeline] Planning %s for '%s'", plan_id, instruction)
+
+                # TIER 1: Decompose
+                subtasks = await self.tier1_decomposer.decompose_task(
+                    task_instruction=instruction,
+                    vision_frame=None, 
+                    detected_objects=perception.detected_objects
+                )
+
+                # TIER 2: Long-Horizon Plan
+                plan_result = await self.tier2_planner.plan_action_chunks(
+                    subtasks=subtasks,
+                    current_frame=None, 
+                    robot_state=input_dict["state"], # reuse the dump taken for hashing
+                    task_instruction=instruction
+                )
+
+                # TIER 3/4: Encode & Map
+                raw_chunks = plan_result["chunks"]
+
+                # CPU-bound encode/map runs on a worker thread so the event loop keeps
+                # serving other tools (e.g. stabilize) while a long plan is encoded.
+                traj_objects = await asyncio.to_thread(self._encode_and_map, raw_chunks, perception, state)
+
+                # 2. Finalize Chunk IDs deterministically
+                final_chunks = []
+                chunk_index = {}
+                # One timestamp per plan: every chunk and the plan itself share it
+                created_at = global_clock.now()
+                for i, traj in enumerate(traj_objects):
+                    # One dump + hash per chunk; the digest is kept on the chunk for reuse
+                    payload_digest = StableHasher.sha256_stream(traj.model_dump())
+                    chunk_id = _chunk_id(plan_id, i, payload_digest)
+                    traj._payload_digest = payload_digest
+                    traj.chunk_id = chunk_id
+                    traj.plan_id = plan_id
+                    traj.ordinal = i
+                    traj.timestamp = created_at
+                    final_chunks.append(traj)
+                    chunk_index[chunk_id] = traj
+
+                plan = TaskPlan(
+                    plan_id=plan_id,
+                    instruction=instruction,
+                    input_digest=input_digest,
+                    config_digest=config_digest,
+                    chunks=final_chunks,
+                    created_at=created_at
+                )
             
-            self.active_plans[plan_id] = plan
-            return plan
+                self._chunk_index[plan_id] = chunk_index
+                self._plan_exec_ids.setdefault(plan_id, [])
+                self.active_plans[plan_id] = plan
+                return plan
+            finally:
+                self._plan_locks.pop(plan_id, None)
+
+    def _encode_and_map(
+        self, raw_chunks: List[Dict], perception: PerceptionSnapshot, state: RobotStateSnapshot
+    ) -> List[JointTrajectoryChunk]:
+        """Tier 3 -> Tier 4 for one plan. Pure and synchronous (safe off the event loop)."""
+        # Tier 3 streams into Tier 4 chunk by chunk.
+        # Tier 4 never reads per-waypoint tactile guidance, so it is not built here.
+        augmented_chunks = self.tier3_encoder.augment_chunks_with_tactile(
+            raw_chunks, None, perception.detected_objects, perception.tactile_summary,
+            include_waypoints=False
+        )
+        return list(self.tier4_mapper.map_chunks_to_robot(
+            augmented_chunks, self.robot_id, None, None, current_joints=state.to_ordered_dict()
+        ))
 
     async def execute_chunk(self, plan_id: str, chunk_id: str) -> Dict:
         """
         Deterministic Execution Entrypoint.
         """
-        async with self.lock:
+        async with self._exec_lock:
             # 1. Idempotency Check
             exec_id = f"{plan_id}:{chunk_id}"
             if exec_id in self.execution_results:
                 return self.execution_results[exec_id]
 
-            if plan_id not in self.active_plans:
+            # get() refreshes recency, so a plan being executed is not the next one evicted
+            if self.active_plans.get(plan_id) is None:
                 return {"status": "ERROR", "reason": f"Plan {plan_id} not found."}
 
-            plan = self.active_plans[plan_id]
-            target_chunk = next((c for c in plan.chunks if c.chunk_id == chunk_id), None)
-            
-            if not target_chunk:
+            # O(1) lookup via the index built at planning time
+            target_chunk = self._chunk_index[plan_id].get(chunk_id)
+            if target_chunk is None:
                 return {"status": "ERROR", "reason": f"Chunk {chunk_id} not found."}
 
             # 2. Tier 5: Verification (Auth Safety Gate)
             sim_state = self.kinematic_sim.get_state_vector()
-            # Physics verifier now takes Snapshot-derived dicts
-            safety_report = PhysicsEngine.verify_trajectory(
-                target_chunk, sim_state, self.robot_profile["joint_limits"]
-            )
+            is_sim = self.tier6_bridge.mode == "SIM"
+            prepared = None
+            if is_sim:
+                # Physics verifier now takes Snapshot-derived dicts (memoized by Tier 5)
+                safety_report = self.tier5_verifier.check(target_chunk, sim_state)
+            else:
+                # Hardware dispatch setup (server wait, goal build) overlaps verification;
+                # the goal is still only sent once the verdict below is valid.
+                safety_report, prepared = await asyncio.gather(
+                    asyncio.to_thread(self.tier5_verifier.check, target_chunk, sim_state),
+                    self.tier6_bridge.prepare(target_chunk)
+                )
 
             if not safety_report["valid"]:
-                result = {"status": "REJECTED", "reason": safety_report["reason"]}
-                self.execution_results[exec_id] = result
-                return result
+                return self._record_result(plan_id, exec_id, {"status": "REJECTED", "reason": safety_report["reason"]})
 
             # 3. Tier 6: Execution
-            logging.info(f"[Pipeline] Executing {chunk_id}")
-            result = await self.tier6_bridge.execute_trajectory(target_chunk)
+            logger.debug("[Pipeline] Executing %s", chunk_id)
+            if is_sim:
+                # SIM steps never wait on the event loop; call the tick directly
+                result = self.tier6_bridge.simulate_execution(target_chunk)
+            else:
+                result = await self.tier6_bridge.execute_trajectory(target_chunk, prepared)
             
             # 4. Deterministic SIM Update
-            if result.get("success") and self.tier6_bridge.mode == "SIM":
+            if result.get("success") and is_sim:
                 # In SIM, we update based on planned target, NOT wall-clock feedback
                 if isinstance(target_chunk, JointTrajectoryChunk):
                     last_wp = target_chunk.waypoints[-1]
@@ -188,5 +301,4 @@ class MRCPUnifiedPipeline:
                 "executed_at": global_clock.now()
             }
             
-            self.execution_results[exec_id] = final_result
-            return final_result
+            return self._record_result(plan_id, exec_id, final_result)
@@ -1,7 +1,57 @@
 import numpy as np
 import logging
+from functools import lru_cache
 from typing import List, Dict, Optional
 from mcp_robot.runtime.determinism import global_rng, StableHasher
+from mcp_robot.runtime.jit import njit, NUMBA_AVAILABLE
+
+# Interpolation fractions i / 49 for the 50 waypoints of a chunk
+# (arange / 49 rather than linspace so each value is the exact quotient)
+WAYPOINT_ALPHA = np.arange(50, dtype=np.float64) / 49.0
+
+# Per-action end-effector displacement over a chunk (dx, dy, dz)
+WAYPOINT_DELTAS = {
+    "lift": np.array([0.0, 0.0, 0.2]),
+    "walk_to": np.array([0.3, 0.0, 0.0]),
+    "grasp_approach": np.array([0.0, 0.0, -0.1]),
+}
+NO_DELTA = np.zeros(3)
+
+@njit(cache=True)
+def _fill_waypoints(starts, alpha, delta, out):
+    """
+    Fill (N, T, 3) waypoints for a batch of chunks in one native pass:
+    out[c, t] = starts[c] + alpha[t] * delta; values match the NumPy path bit for bit.
+    """
+    for c in range(out.shape[0]):
+        for t in range(out.shape[1]):
+            a = alpha[t]
+            for k in range(3):
+                out[c, t, k] = starts[c, k] + a * delta[k]
+
+# Timestep Constants (from Scope)
+TIMESTEPS_PER_CHUNK = 50
+HZ = 30
+CHUNK_DURATION = TIMESTEPS_PER_CHUNK / HZ # ~1.67s
+
+@lru_cache(maxsize=4096)
+def constant_force_profile(force: float) -> tuple:
+    """
+    Flat force profile over one chunk, interned per force value.
+    Shared between chunks (and re-plans), so it is an immutable tuple.
+    """
+    return (force,) * TIMESTEPS_PER_CHUNK
+
+@lru_cache(maxsize=4096)
+def chunk_latent(seed: int) -> np.ndarray:
+    """
+    64 deterministic latents for a chunk seed.
+    Generator seeding dominates the draw, and seeds recur whenever the same
+    instruction is planned again, so draws are memoized (read-only arrays).
+    """
+    latent = np.random.default_rng(seed).random(64)
+    latent.setflags(write=False)
+    return latent
 
 class ACTLongHorizonPlanner:
     """
@@ -23,7 +73,7 @@ class ACTLongHorizonPlanner:
         Deterministic planning of action chunks.
         """
         # 1. State/Task Digits
-        task_digest = StableHasher.sha256_json(task_instruction)
+        task_digest = StableHasher.sha256_stream(task_instruction)
         
         all_chunks = []
         global_chunk_idx = 0
@@ -43,19 +93,13 @@ class ACTLongHorizonPlanner:
     
     def _plan_subtask(self, subtask: Dict, task_digest: str, start_idx: int) -> List[Dict]:
         """Predict action chunks for a subtask using deterministic seeds."""
-        
-        # Timestep Constants (from Scope)
-        TIMESTEPS_PER_CHUNK = 50
-        HZ = 30
-        CHUNK_DURATION = TIMESTEPS_PER_CHUNK / HZ # ~1.67s
-        
         est_duration = subtask.get("estimated_duration", 2.0)
         num_chunks = max(1, int(est_duration / CHUNK_DURATION))
         
-        chunks = []
+        latents = []
         for i in range(num_chunks):
             # Create a unique latent seed for this specific chunk
-            chunk_seed = StableHasher.sha256_json({
+            chunk_seed = StableHasher.sha256_stream({
                 "task_digest": task_digest,
                 "subtask_type": subtask["type"],
                 "ordinal": start_idx + i
@@ -63,15 +107,21 @@ class ACTLongHorizonPlanner:
             
             # Use seed to generate deterministic "latents" (0.0 to 1.0)
             # We take first 8 chars of hex as int for seed
-            chunk_rng = np.random.default_rng(int(chunk_seed[:8], 16))
-            latent = chunk_rng.random(64)
-            
+            latents.append(chunk_latent(int(chunk_seed[:8], 16)))
+        
+        # Waypoints for every chunk of the subtask in one (N, 50, 3) block.
+        # Chunks carry read-only views into it (structure-of-arrays), not nested lists.
+        all_waypoints = self._generate_waypoints(np.stack(latents), subtask["type"])
+        all_waypoints.setflags(write=False)
+        
+        chunks = []
+        for i, (latent, waypoints) in enumerate(zip(latents, all_waypoints)):
             chunk = {
                 "id": start_idx + i, # Temporary ID, pipeline will overwrite with hash
                 "subtask_id": subtask["type"],
-                "latent": latent.tolist(),
-                "position_waypoints": self._generate_waypoints(latent, subtask["type"]),
-                "force_profile": [float(latent[3] * 20.0)] * TIMESTEPS_PER_CHUNK,
+                "latent": latent, # read-only, shared with the latent cache
+                "position_waypoints": waypoints,
+                "force_profile": constant_force_profile(float(latent[3] * 20.0)),
                 "duration_s": CHUNK_DURATION,
                 "criticality": subtask["criticality"],
                 "estimated_force": float(latent[4] * 100.0)
@@ -80,24 +130,22 @@ class ACTLongHorizonPlanner:
             
         return chunks
 
-    def _generate_waypoints(self, latent: np.ndarray, action_type: str) -> List[List[float]]:
-        """Deterministic waypoint generation (Mock Forward Dynamics)."""
+    def _generate_waypoints(self, latents: np.ndarray, action_type: str) -> np.ndarray:
+        """
+        Deterministic waypoint generation (Mock Forward Dynamics).
+        Takes an (N, 64) latent batch and returns an (N, 50, 3) array of [x, y, z] waypoints.
+        """
         # Map latent to a start/end delta
         # Typical workspace is around 0.5
-        start_x, start_y, start_z = latent[0]*0.5, latent[1]*0.5, latent[2]*0.5
+        starts = latents[:, :3] * 0.5
         
         # Define movement based on action type
-        dx, dy, dz = 0.0, 0.0, 0.0
-        if action_type == "lift": dz = 0.2
-        elif action_type == "walk_to": dx = 0.3
-        elif action_type == "grasp_approach": dz = -0.1
+        delta = WAYPOINT_DELTAS.get(action_type, NO_DELTA)
         
-        waypoints = []
-        for i in range(50):
-            alpha = i / 49.0
-            waypoints.append([
-                float(start_x + alpha * dx),
-                float(start_y + alpha * dy),
-                float(start_z + alpha * dz)
-            ])
+        # (N, 50, 3); same per-element arithmetic as start + alpha * delta
+        if NUMBA_AVAILABLE:
+            waypoints = np.empty((starts.shape[0], WAYPOINT_ALPHA.shape[0], 3))
+            _fill_waypoints(starts, WAYPOINT_ALPHA, delta, waypoints)
+        else:
+            waypoints = starts[:, None, :] + WAYPOINT_ALPHA[None, :, None] * delta
         return waypoints
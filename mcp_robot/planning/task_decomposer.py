@@ -1,8 +1,40 @@
+import re
 import numpy as np
 import logging
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Set
 from mcp_robot.runtime.determinism import global_rng, StableHasher
 
+# Action Map: (Keyword -> Sequence of subtask types), matched in this order
+ACTION_MAP = {
+    "pick": ["walk_to", "scan_workspace", "grasp_approach", "grasp_close", "lift"],
+    "place": ["walk_to", "release"],
+    "move": ["grasp_approach", "grasp_close", "lift", "move_to", "release"]
+}
+
+# Stable duration constants (seconds) per subtask type
+SUBTASK_DURATIONS = MappingProxyType({
+    "walk_to": 4.0,
+    "grasp_approach": 2.0,
+    "grasp_close": 0.5,
+    "lift": 1.0,
+    "release": 0.5,
+    "scan_workspace": 1.0,
+    "idle": 0.0
+})
+
+# Deterministic criticality classes
+HIGH_CRITICALITY = frozenset(("grasp_close", "lift", "release"))
+MEDIUM_CRITICALITY = frozenset(("grasp_approach", "move_to", "walk_to"))
+
+# Fallback target keywords, in priority order
+TARGET_KEYWORDS = ("cube", "apple", "bin")
+
+# One scan per instruction for action and target keywords together (plain substring
+# semantics, no word boundaries). The lookahead reports overlapping occurrences, so
+# hits match per-keyword `in` tests as long as no keyword is a prefix of another.
+_KEYWORD_RE = re.compile("(?=(%s))" % "|".join(map(re.escape, (*ACTION_MAP, *TARGET_KEYWORDS))))
+
 class ALOHATaskDecomposer:
     """
     Tier 1: High-Level Planning (Deterministic ALOHA).
@@ -27,7 +59,7 @@ class ALOHATaskDecomposer:
             detected_objects = []
 
         # Generate a stable "embedding" digest for the instruction
-        task_digest = StableHasher.sha256_json(task_instruction)
+        task_digest = StableHasher.sha256_stream(task_instruction)
         
         logging.info(f"[Tier 1] Processing task: '{task_instruction}' (Digest: {task_digest[:8]})")
         
@@ -35,27 +67,22 @@ class ALOHATaskDecomposer:
         subtasks = []
         instruction_lower = task_instruction.lower()
         
-        # Action Map: (Keyword -> Sequence of subtask types)
-        action_map = {
-            "pick": ["walk_to", "scan_workspace", "grasp_approach", "grasp_close", "lift"],
-            "place": ["walk_to", "release"],
-            "move": ["grasp_approach", "grasp_close", "lift", "move_to", "release"]
-        }
-        
-        # Identify actions from instruction
+        # Identify actions from instruction (the same hits serve the target fallback)
+        hits = set(_KEYWORD_RE.findall(instruction_lower))
         planned_actions = []
-        for keyword, sequence in action_map.items():
-            if keyword in instruction_lower:
+        for keyword, sequence in ACTION_MAP.items():
+            if keyword in hits:
                 planned_actions.extend(sequence)
         
         if not planned_actions:
             planned_actions = ["idle"]
 
+        # Resolve target object from detected_objects or instruction.
+        # Depends only on the instruction and detections, so it is resolved once.
+        target = self._resolve_target(None, instruction_lower, detected_objects, hits)
+        
         # 2. Build Subtask Specs
         for i, action_type in enumerate(planned_actions):
-            # Resolve target object from detected_objects or instruction
-            target = self._resolve_target(action_type, instruction_lower, detected_objects)
-            
             subtask = {
                 "type": action_type,
                 "target_object": target,
@@ -67,37 +94,36 @@ class ALOHATaskDecomposer:
         
         return subtasks
     
-    def _resolve_target(self, action_type: str, instruction: str, objects: List[Dict]) -> str:
-        """Deterministically resolve the target object."""
+    def _resolve_target(
+        self, action_type: Optional[str], instruction: str, objects: List[Dict],
+        keyword_hits: Optional[Set[str]] = None
+    ) -> str:
+        """
+        Deterministically resolve the target object.
+        `keyword_hits` is the instruction's keyword scan, when the caller already has it.
+        """
         # Check if any detected object's type is in the instruction
         for obj in objects:
             if obj.get("type", "").lower() in instruction:
                 return obj["type"]
         
         # Fallback to instruction keywords
-        if "cube" in instruction: return "cube"
-        if "apple" in instruction: return "apple"
-        if "bin" in instruction: return "bin"
+        if keyword_hits is None:
+            keyword_hits = set(_KEYWORD_RE.findall(instruction))
+        for keyword in TARGET_KEYWORDS:
+            if keyword in keyword_hits:
+                return keyword
         
         return "object"
 
     def _get_duration(self, action_type: str) -> float:
         """Stable duration constants."""
-        durations = {
-            "walk_to": 4.0,
-            "grasp_approach": 2.0,
-            "grasp_close": 0.5,
-            "lift": 1.0,
-            "release": 0.5,
-            "scan_workspace": 1.0,
-            "idle": 0.0
-        }
-        return durations.get(action_type, 1.0)
+        return SUBTASK_DURATIONS.get(action_type, 1.0)
 
     def _assess_criticality(self, action_type: str) -> str:
         """Deterministic criticality mapping."""
-        if action_type in ["grasp_close", "lift", "release"]:
+        if action_type in HIGH_CRITICALITY:
             return "high"
-        elif action_type in ["grasp_approach", "move_to", "walk_to"]:
+        elif action_type in MEDIUM_CRITICALITY:
             return "medium"
         return "low"
@@ -2,43 +2,171 @@ import hashlib
 import json
 import numpy as np
 import time
-from typing import Any, Dict, Optional, Union
-from pydantic import BaseModel, Field
+from itertools import repeat
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+from mcp_robot.runtime.fastjson import orjson, ORJSON_AVAILABLE
 
 class DeterminismConfig(BaseModel):
-    """Global configuration for deterministic execution."""
+    """
+    Global configuration for deterministic execution.
+    Frozen: pipelines hash the config once, so it must not change in place.
+    """
+    model_config = ConfigDict(frozen=True)
+
     seed: int = 42
     float_round: int = 6
     stable_json: bool = True
     deterministic_mode: bool = True
 
+_INF = float("inf")
+_SCALAR_TYPES = frozenset((float, int, str, bool, type(None)))
+_FLOAT_ONLY = {float}
+_LIST_ONLY = frozenset((list,))
+_encode_flat = json.JSONEncoder(separators=(",", ":")).encode
+_float_repr = float.__repr__
+_int_repr = int.__repr__
+
+# orjson output differs from json.dumps only in exponent notation ("1e16", "0.00001"),
+# NaN/Infinity (written as null), string escaping, DEL (U+007F, which orjson writes raw)
+# and non-ASCII text. Any output that could hold one of those is re-encoded by the
+# stdlib; the rest is byte-identical.
+_ORJSON_UNSAFE = (b"e", b"n", b"0.0000", b"\\", b"\x7f")
+
+def _encode_rounded(rounded: list) -> str:
+    """Compact JSON for an already rounded scalar list (or list of rows)."""
+    if ORJSON_AVAILABLE:
+        try:
+            data = orjson.dumps(rounded)
+        except orjson.JSONEncodeError: # e.g. ints beyond 64 bits
+            data = None
+        if data is not None and data.isascii() and not any(tok in data for tok in _ORJSON_UNSAFE):
+            return data.decode("ascii")
+    return _encode_flat(rounded)
+
+def _float_token(value: float) -> str:
+    """JSON token for a float, exactly as json.dumps writes it."""
+    if value != value:
+        return "NaN"
+    if value == _INF:
+        return "Infinity"
+    if value == -_INF:
+        return "-Infinity"
+    return _float_repr(value)
+
+def _key_token(key: Any) -> str:
+    """JSON object key, coerced the way json.dumps coerces non-str keys."""
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    if key is True:
+        return '"true"'
+    if key is False:
+        return '"false"'
+    if key is None:
+        return '"null"'
+    if isinstance(key, float):
+        return '"' + _float_token(key) + '"'
+    if isinstance(key, int):
+        return '"' + _int_repr(key) + '"'
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+def _round_scalars(items: list, ndigits: int) -> Optional[list]:
+    """Rounded copy of a list of JSON scalars, or None if it holds anything else."""
+    types = set(map(type, items))
+    if types == _FLOAT_ONLY:
+        # All-float rows (the common case): round via map, no per-item type test
+        return list(map(round, items, repeat(ndigits, len(items))))
+    if not _SCALAR_TYPES.issuperset(types):
+        return None
+    return [round(item, ndigits) if type(item) is float else item for item in items]
+
+def _emit(obj: Any, out: List[str], ndigits: int, canonical: bool):
+    """
+    Single-pass canonical JSON writer: sorts keys, rounds floats and appends
+    tokens to `out` without building an intermediate canonical tree.
+    `canonical` is False below tuples, which the original canonicalization left as-is.
+    """
+    if isinstance(obj, str):
+        out.append(encode_basestring_ascii(obj))
+    elif isinstance(obj, float):
+        out.append(_float_token(round(obj, ndigits) if canonical else obj))
+    elif obj is None:
+        out.append("null")
+    elif obj is True:
+        out.append("true")
+    elif obj is False:
+        out.append("false")
+    elif isinstance(obj, int):
+        out.append(_int_repr(obj))
+    elif isinstance(obj, dict):
+        if not obj:
+            out.append("{}")
+            return
+        sep = "{"
+        for key, value in sorted(obj.items()):
+            out.append(sep)
+            out.append(_key_token(key))
+            out.append(":")
+            _emit(value, out, ndigits, canonical)
+            sep = ","
+        out.append("}")
+    elif isinstance(obj, (list, tuple)):
+        if not obj:
+            out.append("[]")
+            return
+        inner = canonical and isinstance(obj, list)
+        if inner:
+            # Scalar lists and lists of scalar lists (latents, waypoint rows): round in
+            # comprehensions and let the C encoder write them in one call. Same tokens
+            # as the generic path below.
+            rounded = _round_scalars(obj, ndigits)
+            if rounded is None and _LIST_ONLY.issuperset(map(type, obj)):
+                rows = [_round_scalars(row, ndigits) for row in obj]
+                if None not in rows:
+                    rounded = rows
+            if rounded is not None:
+                out.append(_encode_rounded(rounded))
+                return
+        sep = "["
+        for item in obj:
+            out.append(sep)
+            _emit(item, out, ndigits, inner)
+            sep = ","
+        out.append("]")
+    elif canonical and hasattr(obj, "model_dump"): # Handle Pydantic
+        _emit(obj.model_dump(), out, ndigits, canonical)
+    else:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class StableHasher:
     """Provides stable hashing for JSON-serializable objects."""
     
+    @staticmethod
+    def canonical_json(obj: Any, float_round: int = 6) -> str:
+        """
+        Canonical JSON text: sorted keys, floats rounded to `float_round`, compact separators.
+        """
+        out: List[str] = []
+        _emit(obj, out, float_round, True)
+        return "".join(out)
+
+    @staticmethod
+    def sha256_stream(obj: Any, float_round: int = 6) -> str:
+        """
+        Canonicalizes and hashes a JSON-serializable object in one walk.
+        """
+        out: List[str] = []
+        _emit(obj, out, float_round, True)
+        return hashlib.sha256("".join(out).encode("ascii")).hexdigest()
+
     @staticmethod
     def sha256_json(obj: Any, float_round: int = 6) -> str:
         """
         Canonicalizes and hashes a JSON-serializable object.
+        Kept for compatibility; identical digests to `sha256_stream`.
         """
-        def canonicalize(data):
-            if hasattr(data, "model_dump"): # Handle Pydantic
-                data = data.model_dump()
-            
-            if isinstance(data, dict):
-                return {k: canonicalize(v) for k, v in sorted(data.items())}
-            elif isinstance(data, list):
-                return [canonicalize(i) for i in data]
-            elif isinstance(data, float):
-                return round(data, float_round)
-            return data
-
-        canonical_obj = canonicalize(obj)
-        json_str = json.dumps(
-            canonical_obj, 
-            separators=(',', ':'), 
-            sort_keys=True
-        )
-        return hashlib.sha256(json_str.encode('utf-8')).hexdigest()
+        return StableHasher.sha256_stream(obj, float_round)
 
 class Clock:
     """Robust clock that can be frozen globally."""
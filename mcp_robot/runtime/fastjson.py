@@ -0,0 +1,33 @@
+"""
+Optional orjson support for JSON encoding (compact log records, tool responses).
+Falls back to stdlib json when orjson is not installed.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+def dumps_compact(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (no indentation, no spaces)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _to_builtin(obj: Any) -> Any:
+    """stdlib fallback for the NumPy values orjson serializes natively."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_pretty(obj: Any) -> str:
+    """Serialize to indented (2 spaces), key-sorted JSON text, e.g. for tool responses."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode("utf-8")
+    return json.dumps(obj, sort_keys=True, indent=2, default=_to_builtin)
@@ -0,0 +1,25 @@
+"""
+Optional Numba JIT support.
+Kernels decorated with `njit` compile to native code when numba is installed
+and run as plain Python otherwise, so callers never need to branch on it.
+
+fastmath is always off: it lets the compiler reassociate float arithmetic and
+assume no NaN/Inf, so kernel results would no longer match the NumPy/Python
+paths bit for bit (digests drift) and NaN checks could be optimized away.
+"""
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+
+    def njit(*args, **kwargs):
+        """`numba.njit` with fastmath forced off; supports `@njit` and `@njit(...)`."""
+        kwargs["fastmath"] = False
+        return numba.njit(*args, **kwargs)
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in supporting both `@njit` and `@njit(...)`."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
@@ -0,0 +1,29 @@
+"""
+Size-bounded caches for long-running processes (plans, results, verdicts).
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+class LRUCache(OrderedDict):
+    """Size-bounded dict; reads refresh recency, inserts evict the least recently used."""
+
+    def __init__(self, capacity: int, on_evict: Optional[Callable[[Any, Any], None]] = None):
+        super().__init__()
+        self.capacity = capacity
+        self.on_evict = on_evict
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.capacity:
+            old_key, old_value = self.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
@@ -1,36 +1,34 @@
 import asyncio
 import logging
-import json
 from typing import Dict, List, Optional
 
-from mcp.server.fastmcp import FastMCP
-import mcp.types as types
-
 from mcp_robot.pipeline import MRCPUnifiedPipeline
 from mcp_robot.contracts.schemas import RobotStateSnapshot, PerceptionSnapshot, JointTrajectoryChunk, JointState
 from mcp_robot.runtime.determinism import StableHasher, global_clock
-
-# Initialize FastMCP
-mcp = FastMCP("MCP-Robot Deterministic Control")
+from mcp_robot.runtime.fastjson import dumps_pretty
 
 # Initialize Deterministic Pipeline
 pipeline = MRCPUnifiedPipeline(robot_id="humanoid_01")
 
+# Placeholder camera frame: constant, so its digest is computed once at import
+MOCK_FRAME_DIGEST = StableHasher.sha256_stream("mock_frame")
+# Placeholder detections (validated into fresh dicts per snapshot)
+MOCK_DETECTIONS = (
+    {"type": "cube", "mass": 0.5, "friction_coefficient": 0.6},
+    {"type": "bin", "mass": 5.0, "friction_coefficient": 0.3}
+)
+
 def _get_current_snapshots():
     """Helper to fetch synchronized snapshots for planning."""
     state = pipeline.kinematic_sim.get_state_vector()
     
     perception = PerceptionSnapshot(
-        camera_frame_digest=StableHasher.sha256_json("mock_frame"),
-        detected_objects=[
-            {"type": "cube", "mass": 0.5, "friction_coefficient": 0.6},
-            {"type": "bin", "mass": 5.0, "friction_coefficient": 0.3}
-        ],
+        camera_frame_digest=MOCK_FRAME_DIGEST,
+        detected_objects=list(MOCK_DETECTIONS),
         timestamp=global_clock.now()
     )
     return state, perception
 
-@mcp.tool()
 async def submit_task(instruction: str) -> str:
     """
     Submits a task instruction. 
@@ -40,22 +38,67 @@ async def submit_task(instruction: str) -> str:
     
     plan = await pipeline.process_task(instruction, perception, state)
     
-    # Return canonicalized JSON
-    return json.dumps({
+    # Return key-sorted JSON
+    return dumps_pretty({
         "plan_id": plan.plan_id,
         "instruction": plan.instruction,
         "total_chunks": len(plan.chunks),
         "status": "PLAN_GENERATED",
         "digest": plan.input_digest
-    }, sort_keys=True, indent=2)
+    })
+
+async def get_plan_chunks(plan_id: str, offset: int = 0, limit: int = 16) -> str:
+    """
+    Returns one page of a generated plan's chunks (ids and timing, no waypoints).
+    Clients page through long plans instead of receiving them in one response.
+    """
+    plan = pipeline.active_plans.get(plan_id)
+    if plan is None:
+        return dumps_pretty({"status": "ERROR", "reason": f"Plan {plan_id} not found."})
+    
+    offset = max(0, offset)
+    page = plan.chunks[offset:offset + max(0, limit)]
+    return dumps_pretty({
+        "plan_id": plan_id,
+        "offset": offset,
+        "total_chunks": len(plan.chunks),
+        "chunks": [
+            {"chunk_id": c.chunk_id, "ordinal": c.ordinal, "description": c.description, "duration": c.duration}
+            for c in page
+        ]
+    })
 
-@mcp.tool()
 async def execute_chunk(plan_id: str, chunk_id: str) -> str:
     """Executes a specific chunk from a generated plan."""
     result = await pipeline.execute_chunk(plan_id, chunk_id)
-    return json.dumps(result, sort_keys=True, indent=2)
+    return dumps_pretty(result)
+
+async def execute_chunks(plan_id: str, chunk_ids: List[str]) -> str:
+    """
+    Executes several chunks of a plan, in order, in one tool call.
+    Stops at the first chunk that does not succeed (later chunks assume its end state).
+    """
+    results = []
+    for chunk_id in chunk_ids:
+        result = await pipeline.execute_chunk(plan_id, chunk_id)
+        results.append({"chunk_id": chunk_id, **result})
+        if result.get("status") != "SUCCESS":
+            break
+    return dumps_pretty({
+        "plan_id": plan_id,
+        "executed": len(results),
+        "requested": len(chunk_ids),
+        "results": results
+    })
+
+async def get_execution_logs(n: int = 200) -> str:
+    """
+    Returns the last `n` chunk execution records (oldest first).
+    Only the requested tail is encoded, however long the server has been running.
+    """
+    records = pipeline.recent_executions(n)
+    return dumps_pretty({"count": len(records), "records": records})
 
-@mcp.tool()
 async def stabilize() -> str:
     """
     Triggers a deterministic stabilization trajectory (Home Pose).
@@ -83,11 +126,36 @@ async def stabilize() -> str:
     if result.get("success"):
         pipeline.kinematic_sim.set_joint_state(home_pos)
         
-    return json.dumps({
+    return dumps_pretty({
         "status": "STABILIZED" if result.get("success") else "FAILED",
         "final_state": home_pos
-    }, sort_keys=True, indent=2)
+    })
+
+TOOLS = (submit_task, get_plan_chunks, execute_chunk, execute_chunks, get_execution_logs, stabilize)
+
+_MCP = None
+
+def get_mcp():
+    """
+    The FastMCP server, created (and its tools registered) on first use.
+    FastMCP's import chain is heavy, so importing this module does not pay for it.
+    """
+    global _MCP
+    if _MCP is None:
+        from mcp.server.fastmcp import FastMCP
+        
+        server = FastMCP("MCP-Robot Deterministic Control")
+        for tool in TOOLS:
+            server.tool()(tool)
+        _MCP = server
+    return _MCP
+
+def __getattr__(name: str):
+    # `from mcp_robot.server import mcp` keeps working, but builds the server lazily
+    if name == "mcp":
+        return get_mcp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    mcp.run()
+    get_mcp().run()
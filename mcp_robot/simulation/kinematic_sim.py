@@ -9,11 +9,11 @@ class KinematicSimulator:
     Deterministic Digital Twin.
     Maintains persistent joint state and physical parameters.
     """
+    JOINT_NAMES = ("joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6", "joint_7")
+
     def __init__(self):
-        self.joint_angles = {
-            "joint_1": 0.0, "joint_2": 0.0, "joint_3": 0.0,
-            "joint_4": 0.0, "joint_5": 0.0, "joint_6": 0.0, "joint_7": 0.0
-        }
+        # Joint angles in JOINT_NAMES order, as one contiguous array
+        self._positions = np.zeros(len(self.JOINT_NAMES), dtype=np.float64)
         self.payload_mass = 0.0
         self.base_velocity = 0.0
         self.last_update = global_clock.now()
@@ -24,11 +24,18 @@ class KinematicSimulator:
     def update_base_velocity(self, velocity: float):
         self.base_velocity = velocity
 
+    @property
+    def joint_angles(self) -> Dict[str, float]:
+        """Joint angles by name (a snapshot copy)."""
+        return dict(zip(self.JOINT_NAMES, self._positions.tolist()))
+
     def set_joint_state(self, new_angles: List[float]):
-        keys = list(self.joint_angles.keys())
-        for i, angle in enumerate(new_angles):
-            if i < len(keys):
-                self.joint_angles[keys[i]] = float(np.round(angle, 6))
+        # Extra angles beyond the known joints are ignored
+        n = min(len(new_angles), self._positions.shape[0])
+        if n:
+            head = self._positions[:n]
+            head[:] = np.asarray(new_angles[:n], dtype=np.float64)
+            np.round(head, 6, out=head)
 
     def step(self):
         self.last_update = global_clock.now()
@@ -36,8 +43,8 @@ class KinematicSimulator:
     def get_state_vector(self) -> RobotStateSnapshot:
         """Returns typed snapshot for verification."""
         return RobotStateSnapshot(
-            joint_names=list(self.joint_angles.keys()),
-            joint_positions=list(self.joint_angles.values()),
+            joint_names=list(self.JOINT_NAMES),
+            joint_positions=self._positions.tolist(),
             base_vel=self.base_velocity,
             payload=self.payload_mass,
             timestamp=self.last_update
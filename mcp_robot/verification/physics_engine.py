@@ -1,97 +1,202 @@
 import numpy as np
 import logging
-from typing import Dict, List, Tuple, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple, Optional
 from mcp_robot.contracts.schemas import JointTrajectoryChunk, RobotStateSnapshot
+from mcp_robot.runtime.jit import njit, NUMBA_AVAILABLE
+from mcp_robot.runtime.lru import LRUCache
+
+# Below this many waypoints the per-joint Python loop beats building NumPy arrays
+# (pipeline chunks carry a start and a target waypoint).
+VECTORIZE_MIN_WAYPOINTS = 16
+
+# Report for a trajectory that passes every check, shared (read-only) by all such calls
+_CERTIFIED = MappingProxyType({"valid": True, "reason": "Certified Safe"})
+
+@njit(cache=True)
+def _scan_limits(positions, mins, maxs):
+    """
+    First (waypoint, joint) of an (N, J) position array outside [mins, maxs], in
+    waypoint-major order, or (-1, -1). NaN counts as outside.
+    """
+    for w in range(positions.shape[0]):
+        for j in range(positions.shape[1]):
+            p = positions[w, j]
+            if not (p >= mins[j] and p <= maxs[j]):
+                return w, j
+    return -1, -1
+
+# Last ZMP evaluation as (base_vel, payload, extension, score). Verification and
+# telemetry ask for the same inputs repeatedly while the robot is not moving.
+_zmp_last: Optional[Tuple[float, float, float, float]] = None
+# Inputs within this distance of the last ones reuse its score.
+# 0.0 reuses exact matches only, so scores are identical to recomputing.
+ZMP_INPUT_TOLERANCE = 0.0
+# (joint_names, bounds) -> (mins, maxs); see _normalize_limits
+_limits_cache = LRUCache(64)
+# Bounds of joints missing from the limits table
+_UNBOUNDED = (-np.inf, np.inf)
+
+def verify_trajectory(
+    trajectory: JointTrajectoryChunk, 
+    current_state: RobotStateSnapshot,
+    joint_limits: Dict[str, Tuple[float, float]]
+) -> Mapping:
+    """
+    Authoritative entrypoint for trajectory certification.
+    Returns a report mapping {"valid", "reason"}; the success report is shared
+    and read-only.
+    """
+    # 1. Continuity Check
+    # Does the trajectory start where the robot actually is?
+    start_wp = trajectory.waypoints[0]
+
+    TOLERANCE_RAD = 0.1 # Real-world tight tolerance
+
+    names = trajectory.joint_names
+    if names == current_state.joint_names:
+        # Usual case: same joint order, so the state lines up positionally (no name lookups)
+        current = current_state.joint_positions
+    else:
+        state_dict = current_state.to_ordered_dict()
+        current = [state_dict.get(name) for name in names]
+
+    for name, current_pos, plan_pos in zip(names, current, start_wp.positions):
+        if current_pos is not None:
+            if abs(current_pos - plan_pos) > TOLERANCE_RAD:
+                return {
+                    "valid": False, 
+                    "reason": f"Continuity Error: {name} jumps by {abs(current_pos - plan_pos):.4f} rad"
+                }
+
+    # 2. Joint Limits Check (bounds resolved once per limits table, not per waypoint)
+    bounds, mins, maxs = _normalize_limits(joint_limits, trajectory.joint_names)
+    violation = _first_limit_violation(trajectory, bounds, mins, maxs)
+    if violation is not None:
+        wp_idx, i, pos = violation
+        name = trajectory.joint_names[i]
+        j_min, j_max = bounds[i]
+        return {
+            "valid": False,
+            "reason": f"Limit Error: {name} at waypoint {wp_idx} is {pos:.4f}, out of range [{j_min}, {j_max}]"
+        }
+
+    # 3. Stability Check (ZMP)
+    # We calculate the worst-case ZMP score based on velocity and base position
+    zmp_score = calculate_zmp_stability(
+        base_vel=current_state.base_vel,
+        payload=current_state.payload,
+        extension=0.5 # Avg limb extension
+    )
+
+    if zmp_score < 0.4:
+        return {
+            "valid": False,
+            "reason": f"Stability Error: ZMP Critical ({zmp_score:.2f}) due to high velocity/payload"
+        }
+
+    # 4. Force Check
+    FORCE_LIMIT_N = 100.0
+    if trajectory.max_force_est > FORCE_LIMIT_N:
+         return {
+             "valid": False, 
+             "reason": f"Force Error: Estimated force {trajectory.max_force_est:.1f}N > Limit {FORCE_LIMIT_N}N"
+         }
+
+    return _CERTIFIED
+
+def _normalize_limits(
+    joint_limits: Dict[str, Tuple[float, float]], joint_names: List[str]
+) -> Tuple[List[Tuple[float, float]], np.ndarray, np.ndarray]:
+    """
+    Per-joint (min, max) bounds aligned to `joint_names` (unlisted joints are
+    unbounded), as a list and as min/max arrays. The arrays are cached by the
+    bound values themselves, so edits to a live limits table always take effect.
+    """
+    bounds = [tuple(joint_limits.get(name, _UNBOUNDED)) for name in joint_names]
+    key = (tuple(joint_names), tuple(bounds))
+    cached = _limits_cache.get(key)
+    if cached is None:
+        mins, maxs = np.array(bounds, dtype=np.float64).reshape(-1, 2).T.copy()
+        cached = (mins, maxs)
+        _limits_cache[key] = cached
+    return bounds, cached[0], cached[1]
+
+def _first_limit_violation(
+    trajectory: JointTrajectoryChunk, bounds: List[Tuple[float, float]],
+    mins: np.ndarray, maxs: np.ndarray
+) -> Optional[Tuple[int, int, float]]:
+    """
+    First (waypoint index, joint index, position) outside `bounds`, in waypoint-major
+    order, or None. Long trajectories are checked as one (N, J) array; NaN positions
+    count as violations on both paths.
+    """
+    waypoints = trajectory.waypoints
+    if len(waypoints) >= VECTORIZE_MIN_WAYPOINTS:
+        try:
+            positions = trajectory.positions_matrix()
+        except ValueError: # ragged waypoints: use the loop below
+            positions = None
+        if positions is not None and positions.shape[1] == len(bounds):
+            if NUMBA_AVAILABLE:
+                # One native scan that stops at the first violation
+                wp_idx, i = _scan_limits(positions, mins, maxs)
+                if wp_idx < 0:
+                    return None
+            else:
+                bad = ~((positions >= mins) & (positions <= maxs))
+                if not bad.any():
+                    return None
+                wp_idx, i = np.argwhere(bad)[0]
+            return int(wp_idx), int(i), waypoints[wp_idx].positions[i]
+
+    for wp_idx, wp in enumerate(waypoints):
+        for i, pos in enumerate(wp.positions):
+            j_min, j_max = bounds[i]
+            if not (j_min <= pos <= j_max):
+                return wp_idx, i, pos
+    return None
+
+def calculate_zmp_stability(base_vel: float, payload: float, extension: float) -> float:
+    """
+    Simplified Zero-Moment Point stability model.
+    Returns score [0.0 (Fall) to 1.0 (Static)].
+    """
+    global _zmp_last
+    last = _zmp_last
+    if last is not None:
+        tol = ZMP_INPUT_TOLERANCE
+        if abs(last[0] - base_vel) <= tol and abs(last[1] - payload) <= tol and abs(last[2] - extension) <= tol:
+            return last[3]
+
+    # Baseline score
+    score = 1.0
+
+    # Velocity penalty: High-speed mobile bases reduce the support polygon margin
+    # Unstable > 2.0 m/s for this robot profile
+    score -= (abs(base_vel) * 0.3)
+
+    # Payload penalty: Center of gravity shifts out of bounds
+    # Assumption: 10kg payload at full extension (1.0) causes 0.5 score drop
+    score -= (payload * 0.05 * extension)
+
+    score = max(0.0, min(1.0, score))
+    _zmp_last = (base_vel, payload, extension, score) # one atomic store
+    return score
+
+def calculate_end_effector_force(mass: float, accel: float) -> float:
+    """Deterministic F=ma approximation."""
+    ROBOT_ARM_MASS = 15.0 # kg
+    total_mass = ROBOT_ARM_MASS + mass
+    return total_mass * accel
 
 class PhysicsEngine:
     """
     Stateless, deterministic physics verification engine.
     Computes stability and limit compliance for JointTrajectoryChunks.
+    The checks are module-level functions (cheaper to call on the hot path);
+    the class exposes them under their historical names.
     """
-    
-    @staticmethod
-    def verify_trajectory(
-        trajectory: JointTrajectoryChunk, 
-        current_state: RobotStateSnapshot,
-        joint_limits: Dict[str, Tuple[float, float]]
-    ) -> Dict:
-        """
-        Authoritative entrypoint for trajectory certification.
-        """
-        # 1. Continuity Check
-        # Does the trajectory start where the robot actually is?
-        start_wp = trajectory.waypoints[0]
-        state_dict = current_state.to_ordered_dict()
-        
-        TOLERANCE_RAD = 0.1 # Real-world tight tolerance
-        
-        for i, name in enumerate(trajectory.joint_names):
-            current_pos = state_dict.get(name)
-            if current_pos is not None:
-                plan_pos = start_wp.positions[i]
-                if abs(current_pos - plan_pos) > TOLERANCE_RAD:
-                    return {
-                        "valid": False, 
-                        "reason": f"Continuity Error: {name} jumps by {abs(current_pos - plan_pos):.4f} rad"
-                    }
-
-        # 2. Joint Limits Check
-        for wp_idx, wp in enumerate(trajectory.waypoints):
-            for i, pos in enumerate(wp.positions):
-                name = trajectory.joint_names[i]
-                j_min, j_max = joint_limits.get(name, (-np.inf, np.inf))
-                if not (j_min <= pos <= j_max):
-                    return {
-                        "valid": False,
-                        "reason": f"Limit Error: {name} at waypoint {wp_idx} is {pos:.4f}, out of range [{j_min}, {j_max}]"
-                    }
-
-        # 3. Stability Check (ZMP)
-        # We calculate the worst-case ZMP score based on velocity and base position
-        zmp_score = PhysicsEngine.calculate_zmp_stability(
-            base_vel=current_state.base_vel,
-            payload=current_state.payload,
-            extension=0.5 # Avg limb extension
-        )
-        
-        if zmp_score < 0.4:
-            return {
-                "valid": False,
-                "reason": f"Stability Error: ZMP Critical ({zmp_score:.2f}) due to high velocity/payload"
-            }
-
-        # 4. Force Check
-        FORCE_LIMIT_N = 100.0
-        if trajectory.max_force_est > FORCE_LIMIT_N:
-             return {
-                 "valid": False, 
-                 "reason": f"Force Error: Estimated force {trajectory.max_force_est:.1f}N > Limit {FORCE_LIMIT_N}N"
-             }
-
-        return {"valid": True, "reason": "Certified Safe"}
-
-    @staticmethod
-    def calculate_zmp_stability(base_vel: float, payload: float, extension: float) -> float:
-        """
-        Simplified Zero-Moment Point stability model.
-        Returns score [0.0 (Fall) to 1.0 (Static)].
-        """
-        # Baseline score
-        score = 1.0
-        
-        # Velocity penalty: High-speed mobile bases reduce the support polygon margin
-        # Unstable > 2.0 m/s for this robot profile
-        score -= (abs(base_vel) * 0.3)
-        
-        # Payload penalty: Center of gravity shifts out of bounds
-        # Assumption: 10kg payload at full extension (1.0) causes 0.5 score drop
-        score -= (payload * 0.05 * extension)
-        
-        return max(0.0, min(1.0, score))
-
-    @staticmethod
-    def calculate_end_effector_force(mass: float, accel: float) -> float:
-        """Deterministic F=ma approximation."""
-        ROBOT_ARM_MASS = 15.0 # kg
-        total_mass = ROBOT_ARM_MASS + mass
-        return total_mass * accel
+    verify_trajectory = staticmethod(verify_trajectory)
+    calculate_zmp_stability = staticmethod(calculate_zmp_stability)
+    calculate_end_effector_force = staticmethod(calculate_end_effector_force)
@@ -1,8 +1,15 @@
 import logging
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 from mcp_robot.contracts.schemas import JointTrajectoryChunk, RobotStateSnapshot, PerceptionSnapshot
 from mcp_robot.verification.physics_engine import PhysicsEngine
 from mcp_robot.runtime.determinism import global_clock
+from mcp_robot.runtime.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Bound for memoized PhysicsEngine verdicts
+MAX_CACHED_REPORTS = 4096
 
 class CertificationReport:
     """Structure for a deterministic safety decision."""
@@ -22,8 +29,46 @@ class VerificationEngine:
         logging.info("Loading Tier 1-5 Verification Engine...")
         self.robot_profile = robot_profile
         self.kinematic_sim = kinematic_sim
+        # (trajectory digest, verified state, joint limits) -> PhysicsEngine report
+        self._report_cache: Dict[tuple, Mapping] = LRUCache(MAX_CACHED_REPORTS)
+
+    def check(self, trajectory: JointTrajectoryChunk, state: RobotStateSnapshot) -> Mapping:
+        """
+        Memoized PhysicsEngine verdict. The verdict depends only on the trajectory and on
+        the state fields the engine reads (joints, base velocity, payload) and on the
+        current joint limits, so replays and re-plans of an identical trajectory from
+        the same state reuse the report, while any limit edit forces a fresh check.
+        Pipeline chunks are keyed by their recorded payload digest; other chunks by the
+        exact fields the engine reads, which is far cheaper than canonically hashing the
+        whole model. Reports are shared between callers, so they are read-only.
+        """
+        digest = trajectory.payload_digest
+        if digest is None:
+            digest = (
+                tuple(trajectory.joint_names),
+                tuple(tuple(wp.positions) for wp in trajectory.waypoints),
+                trajectory.max_force_est
+            )
+        joint_limits = self.robot_profile["joint_limits"]
+        key = (
+            digest, tuple(state.joint_names), tuple(state.joint_positions),
+            state.base_vel, state.payload,
+            tuple((name, tuple(bound)) for name, bound in joint_limits.items())
+        )
+        report = self._report_cache.get(key)
+        if report is not None:
+            logger.debug("[Tier 5] verify: cache hit for %s", trajectory.chunk_id)
+            return report
+        report = PhysicsEngine.verify_trajectory(
+            trajectory=trajectory,
+            current_state=state,
+            joint_limits=joint_limits
+        )
+        report = MappingProxyType(report)
+        self._report_cache[key] = report
+        return report
 
-    async def verify_trajectory(
+    def verify_trajectory(
         self, 
         trajectory: JointTrajectoryChunk, 
         state: RobotStateSnapshot,
@@ -31,15 +76,12 @@ class VerificationEngine:
     ) -> CertificationReport:
         """
         The single canonical entrypoint for trajectory safety certification.
+        Synchronous: the physics checks are pure CPU and never await.
         """
         logging.info(f"[Tier 5] Verifying {trajectory.chunk_id} against snapshot...")
         
         # 1. Physics Validation
-        result = PhysicsEngine.verify_trajectory(
-            trajectory=trajectory,
-            current_state=state,
-            joint_limits=self.robot_profile["joint_limits"]
-        )
+        result = self.check(trajectory, state)
         
         # 2. Return Deterministic Report
         return CertificationReport(
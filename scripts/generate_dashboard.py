@@ -10,6 +10,10 @@ os.makedirs("viz_output", exist_ok=True)
 
 def load_logs():
     try:
+        # Append-only NDJSON (one record per line), with the legacy JSON array as fallback
+        if os.path.exists("pipeline_logs.ndjson"):
+            with open("pipeline_logs.ndjson", "r") as f:
+                return [json.loads(line) for line in f if line.strip()]
         if not os.path.exists("pipeline_logs.json"):
             return []
         with open("pipeline_logs.json", "r") as f:
@@ -39,7 +43,11 @@ def plot_tactile_stability(logs):
     
     for i, log in enumerate(logs):
         timestamps.append(i)
-        slips = len([e for e in log.get("tactile_events", []) if e.get("event") == "slip_detected"])
+        events = log.get("tactile_events", [])
+        if isinstance(events, dict): # columnar log
+            slips = list(events.get("event", ())).count("slip_detected")
+        else:
+            slips = len([e for e in events if e.get("event") == "slip_detected"])
         score = max(0, 1.0 - (slips * 0.4)) # Exaggerate for viz
         stability_scores.append(score)
         
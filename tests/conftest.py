@@ -0,0 +1,38 @@
+import pytest
+from mcp_robot.pipeline import MRCPUnifiedPipeline
+from mcp_robot.contracts.schemas import JointTrajectoryChunk, JointState, RobotStateSnapshot, PerceptionSnapshot
+from mcp_robot.runtime.determinism import DeterminismConfig, global_clock
+
+JOINT_NAMES = ("joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6", "joint_7")
+
+@pytest.fixture
+def joint_names():
+    """The default 7-DOF joint order (fresh list per test)."""
+    return list(JOINT_NAMES)
+
+@pytest.fixture
+def pipeline():
+    """Pipeline on a frozen clock and fixed seed."""
+    global_clock.freeze(123456789.0)
+    return MRCPUnifiedPipeline(robot_id="humanoid_test", config=DeterminismConfig(seed=42))
+
+@pytest.fixture
+def make_snapshots():
+    """Factory for fresh (state at the home pose, perception) snapshot pairs."""
+    def make():
+        state = RobotStateSnapshot(joint_names=list(JOINT_NAMES), joint_positions=[0.0] * 7)
+        perception = PerceptionSnapshot(camera_frame_digest="test")
+        return state, perception
+    return make
+
+@pytest.fixture
+def make_trajectory():
+    """Factory for a trajectory chunk through the given rows of joint positions."""
+    def make(rows, chunk_id="c"):
+        return JointTrajectoryChunk(
+            chunk_id=chunk_id, plan_id="p", ordinal=0, description="test",
+            joint_names=list(JOINT_NAMES),
+            waypoints=[JointState(names=list(JOINT_NAMES), positions=list(row)) for row in rows],
+            duration=1.0
+        )
+    return make
@@ -1,5 +1,6 @@
 import pytest
 import asyncio
+import hashlib
 import json
 import numpy as np
 from mcp_robot.pipeline import MRCPUnifiedPipeline
@@ -66,6 +67,39 @@ async def test_execution_idempotency(deterministic_pipeline):
     assert res1 == res2
     assert res1["status"] == "SUCCESS"
 
+def test_streaming_hash_matches_canonical_json():
+    """
+    The single-pass encoder must hash exactly the bytes of the original
+    canonicalize + json.dumps(sort_keys=True) scheme, so digests never drift.
+    """
+    def reference(obj, float_round=6):
+        def canonicalize(data):
+            if hasattr(data, "model_dump"):
+                data = data.model_dump()
+            if isinstance(data, dict):
+                return {k: canonicalize(v) for k, v in sorted(data.items())}
+            elif isinstance(data, list):
+                return [canonicalize(i) for i in data]
+            elif isinstance(data, float):
+                return round(data, float_round)
+            return data
+        return json.dumps(canonicalize(obj), separators=(',', ':'), sort_keys=True)
+
+    state, perception = _mock_snapshots()
+    samples = [
+        "mock_frame", 0.1234567891, None, [], {},
+        {"b": [1.0000004, 2, True, None, "\u00e9"], "a": {"z": [[0.5, -1e-7], [float("inf")]]}},
+        {1: 0.25, 2.5: "x"}, (0.1234567891, {"k": 1}), state, {"perception": perception},
+        {"waypoints": np.random.default_rng(0).normal(size=(50, 3)).tolist()},
+        # Exponent ranges, non-finite values, big ints and escapes (orjson fast path guards)
+        [1.1e-05, 0.0001, 2e16, 123456.000001, float("nan"), -0.0], [2 ** 70, 1.5],
+        [["a\"b", 0.5], ["é", 1.0]], {"tags": ["a\x7fb"]}, ["\x7f", 0.25],
+    ]
+    for obj in samples:
+        expected = reference(obj)
+        assert StableHasher.canonical_json(obj) == expected
+        assert StableHasher.sha256_json(obj) == hashlib.sha256(expected.encode("utf-8")).hexdigest()
+
 def _mock_snapshots():
     state = RobotStateSnapshot(
         joint_names=["joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6", "joint_7"],
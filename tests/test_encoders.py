@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from mcp_robot.action_encoder.universal_action_encoder import UniversalActionEncoder, NUMBA_AVAILABLE
+from mcp_robot.action_encoder.visio_tactile_action_encoder import VisioTactileActionEncoder
+
+def test_profile_joint_count_must_match_ik():
+    """Unvalidated Tier 4 waypoints rely on the profile having one name per IK joint."""
+    profile = {"joint_names": ["joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6"]}
+    encoder = UniversalActionEncoder({"six_dof": profile})
+    chunks = [{"position_waypoints": [[0.5, 0.5, 0.5]], "description": "reach"}]
+    with pytest.raises(ValueError):
+        list(encoder.map_chunks_to_robot(chunks, "six_dof", None, None))
+
+def test_tactile_rounding_matches_python_round():
+    """ZMP shifts and slip thresholds round exactly like round(x, 4), ties included."""
+    encoder = VisioTactileActionEncoder({"gripper": {"max_force_n": 100.0}}, {})
+    grid = [i * 1e-6 for i in range(0, 1_000_001, 500)] # includes values halfway between 4-decimal steps
+    waypoints = [[x, 1.0 - x, 0.5] for x in grid]
+    chunks = [{"position_waypoints": waypoints, "criticality": "high", "target_object": "cube"}]
+    objects = [{"type": "cube", "mass": 0.37, "friction_coefficient": 0.45}]
+
+    (augmented,) = encoder.augment_chunks_with_tactile(chunks, None, objects, {})
+    grip_force = encoder._calculate_grip_force(0.37, 0.45)
+    for wp, guidance in zip(waypoints, augmented["tactile_waypoints"]):
+        assert guidance.predicted_zmp == (round((wp[0] - 0.5) * 0.1, 4), round((wp[1] - 0.5) * 0.1, 4))
+        assert guidance.slip_threshold == round(grip_force * 0.2, 4)
+
+@pytest.mark.parametrize("include_waypoints", [True, False])
+def test_tactile_accepts_streamed_chunks(include_waypoints):
+    """Generators are augmented like lists; include_waypoints=False attaches only chunk flags."""
+    encoder = VisioTactileActionEncoder({}, {})
+    chunks = [
+        {"position_waypoints": [[0.5, 0.5, 0.5], [0.6, 0.4, 0.5]], "criticality": c, "target_object": "cube"}
+        for c in ("high", "medium", "low")
+    ]
+    from_list = list(encoder.augment_chunks_with_tactile(chunks, None, [], {}, include_waypoints))
+    from_iter = list(encoder.augment_chunks_with_tactile(iter(chunks), None, [], {}, include_waypoints))
+
+    assert from_iter == from_list
+    assert [c["is_tactile_critical"] for c in from_list] == [True, True, False]
+    for chunk in from_list:
+        if include_waypoints:
+            assert len(chunk["tactile_waypoints"]) == 2
+            assert chunk["tactile_waypoints"][1].predicted_zmp == (0.01, -0.01)
+        else:
+            assert "tactile_waypoints" not in chunk
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+def test_float32_encoder_runs_fused_kernel():
+    """float32 working precision goes through the numba kernel and stays close to float64."""
+    chunks = [{"position_waypoints": [[x, 1.0 - x, 0.5]]} for x in (0.1, 0.4, 0.9)]
+    wide = list(UniversalActionEncoder({}).map_chunks_to_robot(chunks, "r", None, None))
+    narrow = list(UniversalActionEncoder({}, dtype=np.float32).map_chunks_to_robot(chunks, "r", None, None))
+    for a, b in zip(wide, narrow):
+        np.testing.assert_allclose(b.waypoints[-1].positions, a.waypoints[-1].positions, atol=1e-5)
+
+def test_mapped_models_own_their_name_lists():
+    """Unvalidated models are not copied by pydantic, so Tier 4 must not share lists between them."""
+    chunks = [{"position_waypoints": [[x, 0.5, 0.5]]} for x in (0.2, 0.8)]
+    trajectories = list(UniversalActionEncoder({}).map_chunks_to_robot(
+        chunks, "r", None, None, current_joints={"joint_1": 0.0}
+    ))
+    trajectories[0].waypoints[0].names[0] = "renamed"
+    trajectories[0].joint_names[1] = "renamed"
+    assert trajectories[0].waypoints[1].names[0] == "joint_1"
+    assert trajectories[1].joint_names[1] == "joint_2"
+    assert all(wp.names[0] == "joint_1" for wp in trajectories[1].waypoints)
+
+def test_chunk_without_waypoints_is_rejected():
+    """Every input chunk maps to one trajectory; a chunk with no target cannot be silently dropped."""
+    chunks = [{"id": 0, "position_waypoints": [[0.5, 0.5, 0.5]]}, {"id": 1, "position_waypoints": []}]
+    with pytest.raises(ValueError, match="Chunk 1"):
+        list(UniversalActionEncoder({}).map_chunks_to_robot(chunks, "r", None, None))
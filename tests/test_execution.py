@@ -0,0 +1,47 @@
+import os
+import numpy as np
+from mcp_robot.execution.interpolation import densify_waypoints, interp_linear
+from mcp_robot.execution.ros_helpers import flow_controller_profile
+from mcp_robot.execution.ros_interface import ROS2Adapter
+
+def test_prepared_goals_do_not_share_points(make_trajectory):
+    """A goal built while another waits to be sent must not rewrite its setpoints."""
+    adapter = ROS2Adapter("test_robot")
+    first = adapter._build_goal(make_trajectory([[0.1] * 7] * 2))
+    second = adapter._build_goal(make_trajectory([[0.9] * 7] * 2))
+
+    assert [p.positions for p in first.trajectory.points] == [[0.1] * 7] * 2
+    assert [p.positions for p in second.trajectory.points] == [[0.9] * 7] * 2
+    assert not set(map(id, first.trajectory.points)) & set(map(id, second.trajectory.points))
+
+def test_interp_linear_matches_np_interp():
+    """Dense setpoints agree with per-joint np.interp, including clamping past the ends."""
+    wp_times = np.array([0.0, 0.5, 0.75, 2.0])
+    wp_pos = np.array([[0.0, 1.0], [1.0, -1.0], [1.0, 0.5], [-2.0, 0.0]])
+    out_times = np.linspace(-0.25, 2.25, 41)
+    out_pos = np.empty((41, 2))
+    interp_linear(wp_times, wp_pos, out_times, out_pos)
+    for j in range(2):
+        np.testing.assert_allclose(out_pos[:, j], np.interp(out_times, wp_times, wp_pos[:, j]), atol=1e-12)
+
+    single = np.empty((3, 2))
+    interp_linear(np.array([0.0]), wp_pos[:1], np.array([0.0, 1.0, 2.0]), single)
+    assert single.tolist() == [[0.0, 1.0]] * 3
+
+def test_densify_waypoints_spans_duration():
+    times, positions = densify_waypoints([[0.0] * 7, [1.0] * 7], duration=1.0, rate_hz=10.0, dtype=np.float64)
+    assert times.shape == (11,) and positions.shape == (11, 7)
+    assert times[0] == 0.0 and times[-1] == 1.0
+    np.testing.assert_allclose(positions[:, 0], times)
+
+def test_flow_controller_profile_is_scoped(monkeypatch):
+    """The profile only lives for the with-block and never switches QoS over to XML."""
+    monkeypatch.delenv("FASTRTPS_DEFAULT_PROFILES_FILE", raising=False)
+    monkeypatch.delenv("RMW_FASTRTPS_USE_QOS_FROM_XML", raising=False)
+    with flow_controller_profile(30000) as path:
+        assert os.environ["FASTRTPS_DEFAULT_PROFILES_FILE"] == path
+        with open(path) as f:
+            assert "<max_bytes_per_period>30000</max_bytes_per_period>" in f.read()
+        assert "RMW_FASTRTPS_USE_QOS_FROM_XML" not in os.environ
+    assert "FASTRTPS_DEFAULT_PROFILES_FILE" not in os.environ
+    assert not os.path.exists(path)
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from pydantic import ValidationError
+from mcp_robot.runtime.determinism import DeterminismConfig
+from mcp_robot.runtime.lru import LRUCache
+
+@pytest.mark.asyncio
+async def test_snapshot_edits_replan(pipeline, make_snapshots):
+    """A snapshot edited in place is a new input, not a cached plan."""
+    state, perception = make_snapshots()
+    plan1 = await pipeline.process_task("Move to table", perception, state)
+
+    state.joint_positions[0] = 1.0
+    plan2 = await pipeline.process_task("Move to table", perception, state)
+    assert plan2.plan_id != plan1.plan_id
+    assert plan2.chunks[0].waypoints[0].positions[0] == 1.0
+
+def test_config_is_immutable(pipeline):
+    """The config digest is cached, so in-place edits must be impossible."""
+    digest = pipeline._config_digest
+    with pytest.raises(ValidationError):
+        pipeline.config.seed = 7
+    pipeline.config = DeterminismConfig(seed=7)
+    assert pipeline._config_digest != digest
+
+@pytest.mark.asyncio
+async def test_plan_eviction_drops_its_index_and_results(pipeline, make_snapshots):
+    """Chunk index and idempotency records are bounded by, and evicted with, their plan."""
+    pipeline.active_plans.capacity = 1
+    state, perception = make_snapshots()
+    first = await pipeline.process_task("Move to table", perception, state)
+    chunk_id = first.chunks[0].chunk_id
+    assert (await pipeline.execute_chunk(first.plan_id, chunk_id))["status"] == "SUCCESS"
+    assert f"{first.plan_id}:{chunk_id}" in pipeline.execution_results
+
+    state, perception = make_snapshots()
+    second = await pipeline.process_task("Pick up the apple", perception, state)
+    assert list(pipeline.active_plans) == [second.plan_id]
+    assert first.plan_id not in pipeline._chunk_index
+    assert not any(key.startswith(first.plan_id) for key in pipeline.execution_results)
+    assert (await pipeline.execute_chunk(first.plan_id, chunk_id))["status"] == "ERROR"
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_plan_once(pipeline, make_snapshots, monkeypatch):
+    """Requests for the same plan share one planning pass; locks are released afterwards."""
+    calls = []
+    decompose = pipeline.tier1_decomposer.decompose_task
+
+    async def counting_decompose(**kwargs):
+        calls.append(kwargs["task_instruction"])
+        await asyncio.sleep(0) # let the other requests reach the plan lock
+        return await decompose(**kwargs)
+
+    def request(instruction):
+        state, perception = make_snapshots() # equal but distinct snapshots per request
+        return pipeline.process_task(instruction, perception, state)
+
+    monkeypatch.setattr(pipeline.tier1_decomposer, "decompose_task", counting_decompose)
+    plans = await asyncio.gather(*(request(i) for i in ["Move to table"] * 3 + ["Pick up the apple"]))
+
+    assert plans[0] is plans[1] is plans[2]
+    assert plans[3].plan_id != plans[0].plan_id
+    assert sorted(calls) == ["Move to table", "Pick up the apple"]
+    assert pipeline._plan_locks == {}
+
+def test_lru_cache_evicts_least_recently_used():
+    evicted = []
+    cache = LRUCache(2, on_evict=lambda key, value: evicted.append(key))
+    cache["a"], cache["b"] = 1, 2
+    assert cache["a"] == 1 # refreshes "a"
+    cache["c"] = 3
+    assert evicted == ["b"]
+    assert list(cache) == ["a", "c"]
+
+@pytest.mark.asyncio
+async def test_executing_a_plan_keeps_it_cached(pipeline, make_snapshots):
+    """Executing refreshes a plan's recency, so its idempotency records outlive idler plans."""
+    pipeline.active_plans.capacity = 2
+    plans = []
+    for instruction in ("Move to table", "Pick up the apple"):
+        state, perception = make_snapshots()
+        plans.append(await pipeline.process_task(instruction, perception, state))
+    running, idle = plans
+    await pipeline.execute_chunk(running.plan_id, running.chunks[0].chunk_id)
+
+    state, perception = make_snapshots()
+    await pipeline.process_task("Place the cube", perception, state)
+    assert running.plan_id in pipeline.active_plans
+    assert idle.plan_id not in pipeline.active_plans
+    assert f"{running.plan_id}:{running.chunks[0].chunk_id}" in pipeline.execution_results
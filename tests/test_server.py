@@ -0,0 +1,49 @@
+import json
+import pytest
+from mcp_robot import server
+
+@pytest.fixture(autouse=True)
+def fresh_pipeline(monkeypatch, pipeline):
+    """Point the server tools at a fresh deterministic pipeline."""
+    monkeypatch.setattr(server, "pipeline", pipeline)
+    return pipeline
+
+async def _submit(instruction="Pick up the cube and place it in the bin"):
+    return json.loads(await server.submit_task(instruction))["plan_id"]
+
+@pytest.mark.asyncio
+async def test_get_plan_chunks_pages(fresh_pipeline):
+    plan_id = await _submit()
+    chunks = fresh_pipeline.active_plans[plan_id].chunks
+    assert len(chunks) > 2
+
+    page = json.loads(await server.get_plan_chunks(plan_id, offset=1, limit=2))
+    assert page["total_chunks"] == len(chunks)
+    assert page["offset"] == 1
+    assert [c["chunk_id"] for c in page["chunks"]] == [c.chunk_id for c in chunks[1:3]]
+    assert "waypoints" not in page["chunks"][0]
+
+    assert json.loads(await server.get_plan_chunks(plan_id, offset=len(chunks)))["chunks"] == []
+    assert json.loads(await server.get_plan_chunks("missing"))["status"] == "ERROR"
+
+@pytest.mark.asyncio
+async def test_execute_chunks_stops_at_first_failure(fresh_pipeline):
+    plan_id = await _submit()
+    chunk_ids = [c.chunk_id for c in fresh_pipeline.active_plans[plan_id].chunks]
+
+    batch = json.loads(await server.execute_chunks(plan_id, [chunk_ids[0], "missing", chunk_ids[1]]))
+    assert batch["requested"] == 3
+    assert batch["executed"] == 2
+    assert [r["status"] for r in batch["results"]] == ["SUCCESS", "ERROR"]
+
+@pytest.mark.asyncio
+async def test_get_execution_logs_returns_tail(fresh_pipeline):
+    plan_id = await _submit()
+    chunk_ids = [c.chunk_id for c in fresh_pipeline.active_plans[plan_id].chunks]
+    await server.execute_chunks(plan_id, chunk_ids)
+
+    logs = json.loads(await server.get_execution_logs(n=2))
+    assert logs["count"] == 2
+    assert [r["exec_id"] for r in logs["records"]] == [f"{plan_id}:{c}" for c in chunk_ids[-2:]]
+    assert json.loads(await server.get_execution_logs(n=0))["records"] == []
+    assert json.loads(await server.get_execution_logs())["count"] == len(chunk_ids)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from mcp_robot.verification import physics_engine
+from mcp_robot.verification.physics_engine import PhysicsEngine
+from mcp_robot.verification.verification_engine import VerificationEngine
+
+def _reach(target, n_waypoints=2):
+    """Rows from the home pose to `target` on joint_1, `n_waypoints` long."""
+    return [[0.0] * 7] + [[target] + [0.0] * 6] * (n_waypoints - 1)
+
+def test_limit_edits_take_effect(joint_names, make_trajectory, make_snapshots):
+    """In-place edits to a live limits table must never be hidden by cached bounds."""
+    limits = {name: (-3.14, 3.14) for name in joint_names}
+    chunk, (state, _) = make_trajectory(_reach(1.5)), make_snapshots()
+
+    assert PhysicsEngine.verify_trajectory(chunk, state, limits)["valid"]
+    limits["joint_1"] = (-1.0, 1.0)
+    report = PhysicsEngine.verify_trajectory(chunk, state, limits)
+    assert not report["valid"]
+    assert report["reason"].startswith("Limit Error: joint_1 at waypoint 1")
+
+def test_cached_verdict_tracks_profile_limits(joint_names, make_trajectory, make_snapshots):
+    """Tier 5 reuses verdicts for identical inputs, but not across limit edits."""
+    profile = {"joint_limits": {name: (-3.14, 3.14) for name in joint_names}}
+    engine = VerificationEngine(profile, kinematic_sim=None)
+    chunk, (state, _) = make_trajectory(_reach(1.5)), make_snapshots()
+
+    first = engine.check(chunk, state)
+    assert first["valid"]
+    assert engine.check(chunk, state) is first # cache hit
+
+    profile["joint_limits"]["joint_1"] = (-1.0, 1.0)
+    assert not engine.check(chunk, state)["valid"]
+
+def test_shared_reports_are_read_only(joint_names, make_trajectory, make_snapshots):
+    """Certified and cached reports are shared, so no caller may modify them."""
+    profile = {"joint_limits": {name: (-1.0, 1.0) for name in joint_names}}
+    engine = VerificationEngine(profile, kinematic_sim=None)
+    state, _ = make_snapshots()
+    for chunk in (make_trajectory(_reach(0.05)), make_trajectory(_reach(1.5))): # certified, rejected
+        report = engine.check(chunk, state)
+        with pytest.raises(TypeError):
+            report["note"] = "annotated"
+        assert set(engine.check(chunk, state)) == {"valid", "reason"}
+
+def test_verdict_cache_keys_on_state(joint_names, make_trajectory, make_snapshots):
+    """A cached verdict is only reused for the state it was computed from."""
+    profile = {"joint_limits": {name: (-3.14, 3.14) for name in joint_names}}
+    engine = VerificationEngine(profile, kinematic_sim=None)
+    chunk = make_trajectory(_reach(1.0))
+    assert engine.check(chunk, make_snapshots()[0])["valid"]
+
+    moved, _ = make_snapshots()
+    moved.joint_positions[0] = 0.5
+    assert engine.check(chunk, moved)["reason"].startswith("Continuity Error: joint_1")
+    assert len(engine._report_cache) == 2
+
+@pytest.mark.parametrize("seed", range(5))
+def test_limit_scan_paths_agree(monkeypatch, seed, joint_names, make_trajectory):
+    """The numba, NumPy and per-joint loop scans report the same first violation, NaN included."""
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-1.2, 1.2, size=(40, 7))
+    positions[rng.integers(40), rng.integers(7)] = np.nan
+    chunk = make_trajectory(positions.tolist())
+    limits = {name: (-1.0 - 0.05 * i, 1.0 + 0.05 * i) for i, name in enumerate(joint_names)}
+    bounds, mins, maxs = physics_engine._normalize_limits(limits, joint_names)
+
+    results = []
+    for numba, min_waypoints in ((True, 16), (False, 16), (False, len(positions) + 1)):
+        monkeypatch.setattr(physics_engine, "NUMBA_AVAILABLE", numba)
+        monkeypatch.setattr(physics_engine, "VECTORIZE_MIN_WAYPOINTS", min_waypoints)
+        results.append(physics_engine._first_limit_violation(chunk, bounds, mins, maxs))
+    assert results[0] is not None
+    assert results[0][:2] == results[1][:2] == results[2][:2]
+
+    clean = np.clip(np.nan_to_num(positions), -1.0, 1.0)
+    chunk = make_trajectory(clean.tolist())
+    monkeypatch.setattr(physics_engine, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(physics_engine, "VECTORIZE_MIN_WAYPOINTS", 16)
+    assert physics_engine._first_limit_violation(chunk, bounds, mins, maxs) is None